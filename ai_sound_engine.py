@@ -4,11 +4,18 @@ AI-Enhanced Sound Engine for Metro Simulator
 Provides intelligent, adaptive sound generation using machine learning-inspired techniques.
 """
 
+import functools
 import numpy as np
-import random
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from collections import deque
+
+from audio_kernels import (
+    NUMBA_AVAILABLE,
+    SINE_TABLE_SIZE,
+    moving_average,
+    mean_std,
+    render_tone
+)
 
 # Constants
 KMH_TO_MS_DIVISOR = 3.6  # Divisor to convert km/h to m/s (1 km/h = 1000m/3600s = 1/3.6 m/s)
@@ -35,37 +42,56 @@ class AIParameterLearner:
     
     def __init__(self, memory_size: int = 100):
         self.memory_size = memory_size
-        self.parameter_history: Dict[str, deque] = {}
+        # Recent values per parameter in a fixed-size ring, plus the total number learned
+        self._history: Dict[str, np.ndarray] = {}
+        self.history_count: Dict[str, int] = {}
         self.learning_rate = 0.1
         self.variation_model: Dict[str, Dict] = {}
+    
+    @property
+    def parameter_history(self) -> Dict[str, np.ndarray]:
+        """The values currently remembered for each parameter."""
+        return {
+            name: ring[:min(self.history_count[name], self.memory_size)]
+            for name, ring in self._history.items()
+        }
         
     def learn_parameter(self, param_name: str, value: float):
         """Learn from observed parameter values."""
-        if param_name not in self.parameter_history:
-            self.parameter_history[param_name] = deque(maxlen=self.memory_size)
+        if param_name not in self._history:
+            self._history[param_name] = np.zeros(self.memory_size)
+            self.history_count[param_name] = 0
             self.variation_model[param_name] = {
                 'mean': value,
                 'std': 0.1,
                 'trend': 0.0
             }
         
-        self.parameter_history[param_name].append(value)
+        ring = self._history[param_name]
+        count = self.history_count[param_name]
+        ring[count % self.memory_size] = value
+        count += 1
+        self.history_count[param_name] = count
         
         # Update statistical model
-        history_len = len(self.parameter_history[param_name])
+        history_len = min(count, self.memory_size)
         if history_len > 10:
-            values = np.array(self.parameter_history[param_name])
-            new_mean = np.mean(values)
-            new_std = np.std(values)
+            values = ring[:history_len]
+            if NUMBA_AVAILABLE:
+                new_mean, new_std = mean_std(values)
+            else:
+                new_mean = np.mean(values)
+                new_std = np.std(values)
             
             # Smooth update with learning rate
             model = self.variation_model[param_name]
             model['mean'] = (1 - self.learning_rate) * model['mean'] + self.learning_rate * new_mean
             model['std'] = (1 - self.learning_rate) * model['std'] + self.learning_rate * new_std
             
-            # Calculate trend - rate of change per sample
+            # Calculate trend - rate of change per sample from the oldest to the newest value
             # Using history_len for averaging (safe as history_len > 10)
-            model['trend'] = (values[-1] - values[0]) / history_len
+            oldest = ring[count % self.memory_size] if count > self.memory_size else ring[0]
+            model['trend'] = (value - oldest) / history_len
     
     def predict_parameter(self, param_name: str, context: Optional[SoundContext] = None) -> float:
         """
@@ -96,7 +122,7 @@ class AIParameterLearner:
             # Vehicle age affects sound characteristics
             base_value *= (1 + context.vehicle_age * 0.2)
         
-        return np.clip(base_value, 0.0, 2.0)
+        return min(max(base_value, 0.0), 2.0)
 
 
 class IntelligentNoiseGenerator:
@@ -105,8 +131,18 @@ class IntelligentNoiseGenerator:
     Uses spectral analysis and pattern recognition.
     """
     
-    def __init__(self, sample_rate: int = 44100):
+    # The generated noise is broadband (only context coloring is applied), so callers
+    # still need to band-limit it. Generators that already shape their output to the
+    # requested band should set this to False to skip the extra filtering pass.
+    needs_postfilter = True
+    
+    # Rain damps the noise with a low-pass at this frequency (Hz)
+    rain_cutoff = 500
+    
+    def __init__(self, sample_rate: int = 44100, rng: Optional[np.random.Generator] = None):
         self.sample_rate = sample_rate
+        # PCG64 generator for the noise draws (share the caller's to keep seeded runs reproducible)
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.pattern_bank: List[np.ndarray] = []
         self.learner = AIParameterLearner()
         
@@ -128,10 +164,11 @@ class IntelligentNoiseGenerator:
         
         # Predict amplitude variation (ensure minimum audibility)
         amplitude_factor = self.learner.predict_parameter('amplitude', context)
-        amplitude = np.clip(amplitude_factor, 0.8, 1.5) * base_amplitude
+        amplitude = min(max(amplitude_factor, 0.8), 1.5) * base_amplitude
         
-        # Generate base noise
-        noise = np.random.normal(0, amplitude, samples)
+        # Generate base noise (single precision, scaled in place)
+        noise = self.rng.standard_normal(samples, dtype=np.float32)
+        noise *= amplitude
         
         # Add intelligent spectral coloring
         noise = self._apply_spectral_intelligence(noise, context)
@@ -141,6 +178,15 @@ class IntelligentNoiseGenerator:
         
         return noise
     
+    def lowpass_cutoff(self, context: Optional[SoundContext]) -> Optional[float]:
+        """
+        Frequency (Hz) above which noise generated for ``context`` is already
+        damped, or None when its spectrum reaches up to Nyquist.
+        """
+        if context and context.weather_condition == "rain" and int(self.sample_rate / self.rain_cutoff) > 1:
+            return self.rain_cutoff
+        return None
+    
     def _apply_spectral_intelligence(
         self, 
         noise: np.ndarray, 
@@ -152,15 +198,16 @@ class IntelligentNoiseGenerator:
             # Track wear increases high-frequency content
             if context.track_wear > 0.7:
                 # Add more high-frequency rumble
-                hf_noise = np.random.normal(0, 0.05 * context.track_wear, len(noise))
-                noise = noise + hf_noise
+                hf_noise = self.rng.standard_normal(len(noise), dtype=np.float32)
+                hf_noise *= 0.05 * context.track_wear
+                noise += hf_noise
             
             # Weather affects dampening
             if context.weather_condition == "rain":
                 # Rain dampens high frequencies
-                window_size = int(self.sample_rate / 500)
+                window_size = int(self.sample_rate / self.rain_cutoff)
                 if window_size > 1:
-                    noise = np.convolve(noise, np.ones(window_size)/window_size, mode='same')
+                    noise = moving_average(noise, window_size)
         
         return noise
     
@@ -172,15 +219,20 @@ class IntelligentNoiseGenerator:
         """Add micro-patterns learned from context."""
         # Add subtle periodic components based on speed
         if context and context.speed > 0:
-            t = np.linspace(0, len(noise) / self.sample_rate, len(noise), False)
-            
             # Speed-dependent periodic variation (wheel rotation)
             wheel_circumference = 0.8  # meters
             rotation_freq = context.speed / KMH_TO_MS_DIVISOR / wheel_circumference  # Hz
             
             if rotation_freq > 0:
-                periodic = 0.02 * np.sin(2 * np.pi * rotation_freq * t)
-                noise = noise + periodic
+                if NUMBA_AVAILABLE:
+                    # Gathered from the sine table in one compiled pass
+                    periodic = np.empty_like(noise)
+                    render_tone(periodic, rotation_freq * SINE_TABLE_SIZE / self.sample_rate, 0.02)
+                else:
+                    t = np.arange(len(noise), dtype=noise.dtype) / noise.dtype.type(self.sample_rate)
+                    periodic = np.sin(noise.dtype.type(2 * np.pi * rotation_freq) * t)
+                    periodic *= 0.02
+                noise += periodic
         
         return noise
 
@@ -328,18 +380,11 @@ class AdaptiveSoundEvolution:
         self.evolution_state['contact_fatigue'] += abs(context.acceleration) * delta_time * 0.001
         
         # Cap values
-        self.evolution_state['brake_temperature'] = np.clip(
-            self.evolution_state['brake_temperature'], context.temperature, 300.0
-        )
-        self.evolution_state['motor_temperature'] = np.clip(
-            self.evolution_state['motor_temperature'], context.temperature, 120.0
-        )
-        self.evolution_state['bearing_wear'] = np.clip(
-            self.evolution_state['bearing_wear'], 0.0, 1.0
-        )
-        self.evolution_state['contact_fatigue'] = np.clip(
-            self.evolution_state['contact_fatigue'], 0.0, 1.0
-        )
+        state = self.evolution_state
+        state['brake_temperature'] = min(max(state['brake_temperature'], context.temperature), 300.0)
+        state['motor_temperature'] = min(max(state['motor_temperature'], context.temperature), 120.0)
+        state['bearing_wear'] = min(max(state['bearing_wear'], 0.0), 1.0)
+        state['contact_fatigue'] = min(max(state['contact_fatigue'], 0.0), 1.0)
     
     def get_temperature_modulation(self) -> float:
         """Get sound modulation factor based on temperature."""
@@ -358,13 +403,40 @@ class AdaptiveSoundEvolution:
         }
 
 
+@functools.lru_cache(maxsize=64)
+def _event_probabilities(
+    base_probabilities: Tuple[Tuple[str, float], ...],
+    high_speed: bool,
+    track_wear: float,
+    vehicle_age: float
+) -> np.ndarray:
+    """Get the shared read-only per-check event probabilities for a context."""
+    # Adjust probabilities based on context
+    adjusted_probs = dict(base_probabilities)
+    
+    # Track wear increases defect probability
+    adjusted_probs['rail_defect'] *= (1 + track_wear)
+    
+    # Speed affects curve likelihood
+    if high_speed:
+        adjusted_probs['curve'] *= 1.5
+    
+    # Old vehicles more likely to have issues
+    adjusted_probs['wheel_squeal'] *= (1 + vehicle_age * 0.5)
+    
+    # Scale down for per-second check
+    probs = np.array(list(adjusted_probs.values())) * 0.01
+    probs.setflags(write=False)
+    return probs
+
+
 class IntelligentEventPredictor:
     """
     AI system that predicts and schedules realistic sound events.
     Uses probabilistic models based on context.
     """
     
-    def __init__(self):
+    def __init__(self, rng: Optional[np.random.Generator] = None):
         self.event_history: List[Tuple[float, str]] = []
         self.base_probabilities = {
             'curve': 0.15,
@@ -373,7 +445,18 @@ class IntelligentEventPredictor:
             'wheel_squeal': 0.08,
             'brake_squeal': 0.06
         }
-        
+        self.event_types = tuple(self.base_probabilities)
+        # PCG64 generator for the event draws (share the caller's to keep seeded runs reproducible)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
+    def _event_probabilities(self, context: SoundContext) -> np.ndarray:
+        """Per-check probability of each event type, in ``event_types`` order."""
+        # Only these context fields matter, so repeated checks reuse one cached table
+        return _event_probabilities(
+            tuple(self.base_probabilities.items()), context.speed > 50,
+            context.track_wear, context.vehicle_age
+        )
+    
     def predict_event(
         self, 
         current_time: float, 
@@ -383,32 +466,42 @@ class IntelligentEventPredictor:
         Predict if an event should occur based on AI analysis.
         Returns event type or None.
         """
-        # Adjust probabilities based on context
-        adjusted_probs = self.base_probabilities.copy()
-        
-        # Track wear increases defect probability
-        adjusted_probs['rail_defect'] *= (1 + context.track_wear)
-        
-        # Speed affects curve likelihood
-        if context.speed > 50:
-            adjusted_probs['curve'] *= 1.5
-        
-        # Old vehicles more likely to have issues
-        adjusted_probs['wheel_squeal'] *= (1 + context.vehicle_age * 0.5)
+        return self.predict_events([current_time], context)[0]
+    
+    def predict_events(
+        self,
+        times,
+        context: SoundContext
+    ) -> List[Optional[str]]:
+        """
+        Predict events for a batch of check times in one pass.
+        Returns the event type or None for each time, in order.
+        """
+        probs = self._event_probabilities(context)
         
-        # Check recent history to avoid clustering
-        recent_events = [e for t, e in self.event_history if current_time - t < 5.0]
+        # One draw per check and event type; the first type under its threshold wins
+        draws = self.rng.random((len(times), len(probs)))
+        events: List[Optional[str]] = [None] * len(times)
         
-        for event_type, base_prob in adjusted_probs.items():
-            # Reduce probability if event occurred recently
-            if event_type in recent_events:
-                base_prob *= 0.3
+        # Recent events only lower probabilities, so checks without any draw under
+        # the unpenalized thresholds cannot fire and are skipped
+        for row in np.flatnonzero((draws < probs).any(axis=1)).tolist():
+            current_time = times[row]
             
-            if random.random() < base_prob * 0.01:  # Scale down for per-second check
-                self.event_history.append((current_time, event_type))
-                # Keep history manageable
-                if len(self.event_history) > 100:
-                    self.event_history = self.event_history[-100:]
-                return event_type
-        
-        return None
+            # Check recent history to avoid clustering
+            recent_events = {e for t, e in self.event_history if current_time - t < 5.0}
+            
+            for event_type, prob, draw in zip(self.event_types, probs.tolist(), draws[row].tolist()):
+                # Reduce probability if event occurred recently
+                if event_type in recent_events:
+                    prob *= 0.3
+                
+                if draw < prob:
+                    self.event_history.append((current_time, event_type))
+                    # Keep history manageable
+                    if len(self.event_history) > 100:
+                        self.event_history = self.event_history[-100:]
+                    events[row] = event_type
+                    break
+        
+        return events
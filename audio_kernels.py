@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Audio Kernels for Metro Simulator
+Fused single-pass synthesis loops (JIT-compiled with Numba when it is installed)
+and O(N) filtering helpers shared by the sound generators.
+"""
+
+import functools
+import math
+import os
+import numpy as np
+
+# Try to import numba, but allow the kernels to run as plain Python without it.
+# Kernels are compiled eagerly for explicit float32/float64 signatures and cached
+# to disk, so only the very first import pays the compile time. They release the
+# GIL so worker threads can keep rendering other layers meanwhile.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function uncompiled."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Try to import scipy.signal for IIR filtering, falling back to moving averages without it
+try:
+    from scipy import fft as scipy_fft
+    from scipy import signal as scipy_signal
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# One period of a sine wave; tones are gathered from it by phase index instead of
+# evaluating sin per sample. The size is a power of two so the phase wraps with a mask.
+SINE_TABLE_SIZE = 4096
+SINE_TABLE = np.sin(2 * np.pi * np.arange(SINE_TABLE_SIZE) / SINE_TABLE_SIZE).astype(np.float32)
+SINE_TABLE.setflags(write=False)
+
+
+def moving_average(signal, window_size):
+    """
+    Boxcar low-pass filter, identical to
+    ``np.convolve(signal, np.ones(window_size) / window_size, mode='same')``.
+
+    Uses a running sum so the cost is O(N) instead of O(N * window_size).
+    """
+    samples = len(signal)
+    if samples < window_size:
+        filtered = np.convolve(signal, np.ones(window_size) / window_size, mode='same')
+        return filtered.astype(signal.dtype, copy=False)
+
+    # Zero-padded running sum aligned so each output is a difference of two entries
+    shift = (window_size - 1) // 2
+    running = np.empty(samples + window_size)
+    running[:window_size - shift] = 0.0
+    np.cumsum(signal, dtype=np.float64, out=running[window_size - shift:samples + window_size - shift])
+    running[samples + window_size - shift:] = running[samples + window_size - shift - 1]
+
+    # Running sum stays float64 for accuracy; output keeps the input precision
+    filtered = np.empty(samples, dtype=signal.dtype)
+    np.subtract(running[window_size:], running[:samples], out=filtered)
+    filtered /= window_size
+    return filtered
+
+
+@functools.lru_cache(maxsize=64)
+def bandpass_sos(low_freq, high_freq, sample_rate):
+    """
+    Design (once per band) a 2nd-order Butterworth band-pass in second-order sections.
+
+    The upper edge is kept below Nyquist so high bands stay valid at low sample rates.
+    Requires scipy.
+    """
+    high_freq = min(high_freq, 0.45 * sample_rate)
+    low_freq = min(low_freq, 0.5 * high_freq)
+    return scipy_signal.butter(2, [low_freq, high_freq], btype='bandpass',
+                               fs=sample_rate, output='sos')
+
+
+def bandpass_filter(signal, low_freq, high_freq, sample_rate, inplace=False):
+    """
+    Band-pass filter a signal with a cached Butterworth SOS, keeping its precision.
+
+    Filters with the compiled biquad cascade when Numba is installed, which
+    works on a copy in the signal's own dtype, or on ``signal`` itself (which
+    must then be C-contiguous) with ``inplace``; otherwise uses scipy's sosfilt.
+    Always use the returned array.
+    """
+    sos = bandpass_sos(low_freq, high_freq, sample_rate)
+    if NUMBA_AVAILABLE:
+        filtered = signal if inplace else np.array(signal, order='C')
+        sos_filter(filtered, sos)
+        return filtered
+    return scipy_signal.sosfilt(sos, signal).astype(signal.dtype, copy=False)
+
+
+@functools.lru_cache(maxsize=256)
+def fft_length(samples):
+    """
+    Get an efficient FFT length of at least ``samples``.
+
+    Lengths whose prime factors are all at most 11 are used as they are; other
+    lengths (e.g. large primes, which FFT an order of magnitude slower) are
+    rounded up to the next 2^a * 3^b * 5^c.
+    """
+    remainder = samples
+    for prime in (2, 3, 5, 7, 11):
+        while remainder % prime == 0:
+            remainder //= prime
+    if remainder == 1:
+        return samples
+
+    best = 1 << (samples - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < samples:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def spectral_noise(samples, amplitude, low_freq, high_freq, sample_rate, dtype=np.float32, rng=None):
+    """
+    Synthesize band-limited Gaussian noise directly in the frequency domain.
+
+    Random complex coefficients fill only the rFFT bins in ``[low_freq, high_freq)``
+    and one inverse FFT gives the signal, i.e. white noise of standard deviation
+    ``amplitude`` through an ideal brick-wall band-pass. Draws come from ``rng``
+    (a ``np.random.Generator``), or a fresh default generator if omitted.
+
+    Awkward lengths are synthesized at the next efficient FFT length and
+    truncated, which keeps the noise statistics unchanged.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    length = fft_length(samples)
+    bins = length // 2 + 1
+    k_low = min(int(low_freq * length / sample_rate), bins - 1)
+    k_high = min(max(int(high_freq * length / sample_rate), k_low + 1), bins)
+    band = k_high - k_low
+
+    # Scaled so each bin carries the same energy as white noise would (Parseval)
+    spectrum = np.zeros(bins, dtype=np.complex64)
+    spectrum[k_low:k_high].real = rng.standard_normal(band, dtype=np.float32)
+    spectrum[k_low:k_high].imag = rng.standard_normal(band, dtype=np.float32)
+    spectrum *= amplitude * math.sqrt(length / 2)
+
+    # scipy's FFT stays in single precision for complex64 input
+    if SCIPY_AVAILABLE:
+        noise = scipy_fft.irfft(spectrum, length)
+    else:
+        noise = np.fft.irfft(spectrum, length)
+    return noise[:samples].astype(dtype, copy=length != samples)
+
+
+@njit(["void(f4[::1], f8[:, ::1])",
+       "void(f8[::1], f8[:, ::1])"],
+      cache=True, nogil=True, fastmath=True)
+def sos_filter(x, sos):
+    """
+    Filter ``x`` in place through a cascade of biquads (second-order sections).
+
+    ``sos`` has one ``[b0, b1, b2, a0, a1, a2]`` row per section with ``a0 == 1``,
+    as returned by ``scipy.signal.butter(..., output='sos')``. Each section runs
+    in transposed direct form II with float64 state, matching ``sosfilt`` from
+    rest. All sections advance together sample by sample, so their recursions
+    overlap instead of running one full pass each.
+    """
+    sections = sos.shape[0]
+    state = np.zeros((sections, 2))
+    for i in range(x.shape[0]):
+        value = x[i]
+        for k in range(sections):
+            out = sos[k, 0] * value + state[k, 0]
+            state[k, 0] = sos[k, 1] * value - sos[k, 4] * out + state[k, 1]
+            state[k, 1] = sos[k, 2] * value - sos[k, 5] * out
+            value = out
+        x[i] = value
+
+
+@njit(["void(f4[::1], f8, f8)",
+       "void(f8[::1], f8, f8)"],
+      cache=True, nogil=True, fastmath=True)
+def render_tone(out, step, amplitude):
+    """
+    Fill ``out`` with a sine of the given amplitude gathered from ``SINE_TABLE``.
+
+    ``step`` is the phase increment per sample in table entries, i.e.
+    ``frequency * SINE_TABLE_SIZE / sample_rate``; phases round to the nearest entry.
+    """
+    mask = SINE_TABLE_SIZE - 1
+    for i in range(out.shape[0]):
+        out[i] = amplitude * SINE_TABLE[int(step * i + 0.5) & mask]
+
+
+@njit(["void(f4[::1], f8, f8, i8, f8)",
+       "void(f8[::1], f8, f8, i8, f8)"],
+      cache=True, nogil=True, fastmath=True)
+def render_sweep(out, start_step, sweep_step, fade, amplitude):
+    """
+    Fill ``out`` with a linear frequency sweep gathered from ``SINE_TABLE``.
+
+    The phase is evaluated in closed form at every sample, in table entries:
+    ``start_step * i + 0.5 * sweep_step * i**2``, where ``start_step`` is the
+    start frequency and ``sweep_step`` the frequency change per sample, both in
+    table entries per sample. Linear fades over the first and last ``fade``
+    samples are applied on the fly as a branchless gain, the distance to the
+    nearer end over the fade length, capped at 1.
+
+    Serial on purpose: sweeps are rendered concurrently on worker threads, and
+    Numba's workqueue threading layer aborts on concurrent parallel launches.
+    """
+    mask = SINE_TABLE_SIZE - 1
+    samples = out.shape[0]
+    span = max(fade - 1, 1)
+    for i in range(samples):
+        phase = i * (start_step + 0.5 * sweep_step * i)
+        gain = min(min(i, samples - 1 - i) / span, 1.0)
+        out[i] = amplitude * gain * SINE_TABLE[int(phase + 0.5) & mask]
+
+
+@njit(["void(f4[::1], f8, f8, f8, i8, f8)",
+       "void(f8[::1], f8, f8, f8, i8, f8)"],
+      cache=True, nogil=True, fastmath=True)
+def render_motor_whine(out, start_step, sweep_step, pwm_step, fade, amplitude):
+    """
+    Fill ``out`` with the traction motor whine gathered from ``SINE_TABLE``.
+
+    A linear sweep with its 2nd and 3rd harmonics (0.3 and 0.15), which share
+    the sweep phase of ``render_sweep``, faded the same way and modulated by
+    3% at the inverter switching rate ``pwm_step`` (in table entries per sample).
+    Serial, like ``render_sweep``: the departure is rendered on a worker thread.
+    """
+    mask = SINE_TABLE_SIZE - 1
+    samples = out.shape[0]
+    span = max(fade - 1, 1)
+    for i in range(samples):
+        phase = i * (start_step + 0.5 * sweep_step * i)
+        value = (SINE_TABLE[int(phase + 0.5) & mask]
+                 + 0.3 * SINE_TABLE[int(2.0 * phase + 0.5) & mask]
+                 + 0.15 * SINE_TABLE[int(3.0 * phase + 0.5) & mask])
+        gain = min(min(i, samples - 1 - i) / span, 1.0)
+        pwm = 1.0 + 0.03 * SINE_TABLE[int(pwm_step * i + 0.5) & mask]
+        out[i] = amplitude * gain * pwm * value
+
+
+@njit(["void(f4[::1], i8, f8, f4[::1], f4[::1])",
+       "void(f8[::1], i8, f8, f8[::1], f8[::1])"],
+      cache=True, nogil=True, fastmath=True, parallel=True)
+def render_electric_idle(out, sample_rate, fan_freq, fan_noise, inverter_idle):
+    """
+    Render the station idle layers into ``out`` in a single pass.
+
+    Sums the auxiliary supply hum (60/120/180 Hz), the cycling air compressor,
+    the cooling fan tone, the fan noise and the 120 Hz-modulated inverter noise.
+    """
+    two_pi = 2.0 * math.pi
+    for i in prange(out.shape[0]):
+        ti = i / sample_rate
+        hum = (0.07 * math.sin(two_pi * 120.0 * ti)
+               + 0.04 * math.sin(two_pi * 60.0 * ti)
+               + 0.03 * math.sin(two_pi * 180.0 * ti))
+        compressor = (0.06 * math.sin(two_pi * 180.0 * ti)
+                      * (0.5 + 0.5 * math.sin(two_pi * 0.3 * ti)))
+        fan = 0.05 * math.sin(two_pi * fan_freq * ti)
+        inverter = inverter_idle[i] * (1.0 + 0.1 * math.sin(two_pi * 120.0 * ti))
+        out[i] = hum + compressor + fan + fan_noise[i] + inverter
+
+
+@njit(["void(f4[::1], f4[::1], i8, i8)",
+       "void(f8[::1], f8[::1], i8, i8)"],
+      cache=True, nogil=True, fastmath=True, parallel=True)
+def modulate_rumble(rumble, variation, start, sample_rate):
+    """
+    Apply track variation and vibrations to ``rumble`` in place in a single pass.
+
+    Each sample is scaled by the pre-rolled variation factor read cyclically
+    from ``variation`` starting at index ``start``, plus the 8 Hz track
+    vibration and the 3 Hz wheel rhythm.
+    """
+    two_pi = 2.0 * math.pi
+    n = variation.shape[0]
+    for i in prange(rumble.shape[0]):
+        ti = i / sample_rate
+        factor = (variation[(start + i) % n]
+                  + 0.04 * math.sin(two_pi * 8.0 * ti)
+                  + 0.03 * math.sin(two_pi * 3.0 * ti))
+        rumble[i] *= factor
+
+
+@njit(["void(f4[::1], i8[::1], f4[::1], f4[::1], i8)",
+       "void(f8[::1], i8[::1], f8[::1], f8[::1], i8)"],
+      cache=True, nogil=True, fastmath=True)
+def scatter_clicks(combined, positions, first, second, offset):
+    """
+    Overlap-add a two-part click into ``combined`` at every start in ``positions``.
+
+    ``first`` starts at each position and ``second`` ``offset`` samples later;
+    both are pre-rendered once by the caller and truncated at the buffer end.
+    """
+    samples = combined.shape[0]
+    for k in range(positions.shape[0]):
+        pos = positions[k]
+        for i in range(min(first.shape[0], samples - pos)):
+            combined[pos + i] += first[i]
+
+        pos2 = pos + offset
+        for i in range(min(second.shape[0], samples - pos2)):
+            combined[pos2 + i] += second[i]
+
+
+@njit(["void(f4[::1], i8[::1], i8[::1], f8[::1], f4[:, ::1])",
+       "void(f8[::1], i8[::1], i8[::1], f8[::1], f8[:, ::1])"],
+      cache=True, nogil=True, fastmath=True)
+def scatter_templates(out, positions, rows, gains, templates):
+    """
+    Overlap-add rows of a pre-rendered template table into ``out``.
+
+    Event ``k`` adds ``gains[k] * templates[rows[k]]`` starting at sample
+    ``positions[k]``, truncated at the buffer end.
+    """
+    samples = out.shape[0]
+    n = templates.shape[1]
+    for k in range(positions.shape[0]):
+        pos = positions[k]
+        row = rows[k]
+        gain = gains[k]
+        for i in range(max(0, -pos), min(n, samples - pos)):
+            out[pos + i] += gain * templates[row, i]
+
+
+@njit(["void(f4[::1], f4[::1], f4[::1], f4[::1], f4[::1], f4[::1], f4[::1], i8[::1])",
+       "void(f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], i8[::1])"],
+      cache=True, nogil=True, fastmath=True)
+def mix_layers(out, a, b, c, d, e, f, offsets):
+    """
+    Overwrite ``out`` with the sum of six layers in one pass.
+
+    Layer ``k`` starts at sample ``offsets[k]`` and contributes only where it
+    overlaps ``out``; pass an empty array for unused layers. Serial, like
+    ``render_sweep``: the departure is mixed on a worker thread.
+    """
+    for i in range(out.shape[0]):
+        acc = 0.0
+        j = i - offsets[0]
+        if 0 <= j < a.shape[0]:
+            acc += a[j]
+        j = i - offsets[1]
+        if 0 <= j < b.shape[0]:
+            acc += b[j]
+        j = i - offsets[2]
+        if 0 <= j < c.shape[0]:
+            acc += c[j]
+        j = i - offsets[3]
+        if 0 <= j < d.shape[0]:
+            acc += d[j]
+        j = i - offsets[4]
+        if 0 <= j < e.shape[0]:
+            acc += e[j]
+        j = i - offsets[5]
+        if 0 <= j < f.shape[0]:
+            acc += f[j]
+        out[i] = acc
+
+
+@njit("UniTuple(f8, 2)(f8[::1])", cache=True, nogil=True)
+def mean_std(values):
+    """Mean and population standard deviation of ``values`` in two passes."""
+    n = values.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+    mean = total / n
+    spread = 0.0
+    for i in range(n):
+        deviation = values[i] - mean
+        spread += deviation * deviation
+    return mean, math.sqrt(spread / n)
+
+
+def _warmup():
+    """
+    Run each kernel once on a tiny float32 buffer so that loading the cached
+    machine code and starting Numba's thread pool happen at import time
+    rather than during the first sound. Set METRO_NO_WARMUP to skip.
+    """
+    buffer = np.zeros(64, dtype=np.float32)
+    noise = np.zeros(64, dtype=np.float32)
+    render_tone(buffer, 51.2, 1.0)
+    render_sweep(buffer, 51.2, 0.1, 8, 1.0)
+    render_motor_whine(buffer, 51.2, 0.1, 400.0, 8, 1.0)
+    render_electric_idle(buffer, 8000, 100.0, noise, noise)
+    modulate_rumble(buffer, noise, 0, 8000)
+    sos_filter(buffer, np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]]))
+    scatter_clicks(buffer, np.zeros(1, dtype=np.int64), noise, noise, 8)
+    scatter_templates(buffer, np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64),
+                      np.ones(1), np.zeros((1, 8), dtype=np.float32))
+    mix_layers(buffer, noise, noise, noise, noise, noise, noise, np.zeros(6, dtype=np.int64))
+    mean_std(np.ones(8))
+
+
+if NUMBA_AVAILABLE and not os.environ.get('METRO_NO_WARMUP'):
+    _warmup()
@@ -6,7 +6,6 @@ compressed air systems and electric traction motors.
 """
 
 from metro_sounds import MetroSoundSimulator
-import time
 
 
 def main():
@@ -37,37 +36,43 @@ def main():
     print("   - Door motor and continuous air hiss")
     print("   - Final air equalization and slam")
     simulator.door_closing()
-    time.sleep(1)
+    simulator.pause(1)
     
+    # Label each section once the previous one has finished playing
+    simulator.wait_for_playback()
     print("\n2. Electric Motor Acceleration with Wheel-Rail Sounds:")
     print("   - Power inverter startup (PWM switching)")
     print("   - Traction motor whine (rising pitch)")
     print("   - Low-speed grinding sounds (NEW!)")
     print("   - Occasional wheel slip (NEW!)")
     simulator.acceleration(2.5)
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n3. Ambient Travel with Enhanced Wheel-Rail Contact:")
     print("   - Track rumbling and vibrations")
     print("   - Constant electric motor hum")
     print("   - Rail joint clicks - clickety-clack (NEW!)")
     print("   - Inverter background noise")
     simulator.ambient_rumble(3.0)
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n4. Gentle Curve with Wheel Flange Contact:")
     print("   - Subtle motor frequency changes")
     print("   - Enhanced wheel-rail contact")
     print("   - Occasional flange squeal (NEW!)")
     simulator.gentle_curve(2.5)
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n5. Sharp Turn with Screeching:")
     print("   - Metal on metal screech")
     print("   - High frequency sweep")
     simulator.turn_screech()
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n6. Deceleration with Enhanced Braking Sounds:")
     print("   - Electric regenerative braking (falling pitch)")
     print("   - Compressed air brake engagement")
@@ -75,17 +80,21 @@ def main():
     print("   - Occasional brake squeal (NEW!)")
     print("   - Low-speed grinding at end (NEW!)")
     simulator.deceleration(2.5)
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n7. Station Stop - Electric Idle:")
     print("   - Auxiliary systems humming (120 Hz)")
     print("   - Air compressor cycling (180 Hz)")
     print("   - Inverter standby noise")
     simulator.electric_idle(2.0)
-    time.sleep(0.5)
+    simulator.pause(0.5)
     
+    simulator.wait_for_playback()
     print("\n8. Door Closing Again:")
     simulator.door_closing()
+    simulator.wait_for_playback()
+    simulator.close()
     
     print("\n" + "="*60)
     print("✅ Demo complete!")
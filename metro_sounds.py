@@ -7,9 +7,14 @@ Includes random events like turns with screeching and door closures.
 Comprend des événements aléatoires comme des virages avec grincements et des fermetures de portes.
 """
 
+import collections
+import concurrent.futures
+import functools
 import numpy as np
 import time
 import random
+import queue
+import threading
 from typing import Tuple, Optional
 
 # Try to import sounddevice, but allow the module to work without it for testing
@@ -20,6 +25,13 @@ except (ImportError, OSError):
     AUDIO_AVAILABLE = False
     print("⚠️  Warning: Audio playback not available. Running in silent mode.")
 
+# Try to import numexpr for fused, multi-threaded array expressions (NumPy fallback without it)
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
 # Import AI-enhanced sound engine
 from ai_sound_engine import (
     SoundContext, 
@@ -30,6 +42,209 @@ from ai_sound_engine import (
     IntelligentEventPredictor
 )
 
+# Import compiled synthesis kernels (fall back to NumPy paths without Numba)
+from audio_kernels import (
+    NUMBA_AVAILABLE,
+    SCIPY_AVAILABLE,
+    SINE_TABLE,
+    SINE_TABLE_SIZE,
+    bandpass_filter,
+    moving_average,
+    spectral_noise,
+    render_tone,
+    render_sweep,
+    render_motor_whine,
+    render_electric_idle,
+    modulate_rumble,
+    scatter_clicks,
+    scatter_templates,
+    mix_layers
+)
+
+# Precision of every audio buffer: float32 is plenty for playback and halves the
+# memory traffic of each mix. Phases and time axes of tones stay float64.
+DTYPE = np.float32
+
+
+def _lut_sines(frequencies, samples: int, sample_rate: int,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Gather unit sine waves from the shared sine table.
+    
+    A scalar frequency gives one wave of ``samples`` samples; an array of
+    frequencies gives a ``(len(frequencies), samples)`` float32 matrix.
+    The result is written to ``out`` when given.
+    """
+    # Phase accumulator in table steps (float64 for accuracy), rounded to the
+    # nearest table entry and wrapped to one period
+    phase = np.multiply.outer(np.asarray(frequencies, dtype=np.float64) * (SINE_TABLE_SIZE / sample_rate),
+                              np.arange(samples, dtype=np.float64))
+    np.rint(phase, out=phase)
+    index = phase.astype(np.int64)
+    index &= SINE_TABLE_SIZE - 1
+    # Indices are already in range; 'clip' lets take() write straight into out
+    return SINE_TABLE.take(index, out=out, mode='clip')
+
+
+@functools.lru_cache(maxsize=64)
+def _t_array(sample_rate: int, samples: int) -> np.ndarray:
+    """Get the shared read-only time axis (seconds) for a buffer of ``samples`` samples."""
+    t = np.linspace(0, samples / sample_rate, samples, False)
+    t.setflags(write=False)
+    return t
+
+
+@functools.lru_cache(maxsize=64)
+def _fade_ramp(fade_samples: int, start: float = 0.0, end: float = 1.0) -> np.ndarray:
+    """
+    Get the shared read-only float32 fade ramp from ``start`` to ``end``
+    (0 to 1 by default; reverse it with ``[::-1]`` for fade-outs).
+    """
+    ramp = np.linspace(start, end, fade_samples).astype(DTYPE)
+    ramp.setflags(write=False)
+    return ramp
+
+
+@functools.lru_cache(maxsize=16)
+def _clipped_ramp(samples: int, start: float, end: float, low: float, high: float) -> np.ndarray:
+    """Get the shared read-only float32 envelope ``clip(linspace(start, end, samples), low, high)``."""
+    envelope = np.clip(np.linspace(start, end, samples), low, high).astype(DTYPE)
+    envelope.setflags(write=False)
+    return envelope
+
+
+def _apply_fades(audio: np.ndarray, fade_in: int, fade_out: int,
+                 start: float = 0.0, end: float = 0.0) -> np.ndarray:
+    """
+    Fade ``audio`` in place, rising from ``start`` over the first ``fade_in``
+    samples and falling to ``end`` over the last ``fade_out`` samples.
+    Only the two ends are touched; the middle is left at full level.
+    """
+    if fade_in > 0:
+        audio[:fade_in] *= _fade_ramp(fade_in, start, 1.0)
+    if fade_out > 0:
+        audio[-fade_out:] *= _fade_ramp(fade_out, 1.0, end)
+    return audio
+
+
+@functools.lru_cache(maxsize=16)
+def _am_envelope(sample_rate: int, samples: int, frequency: float, depth: float) -> np.ndarray:
+    """Get the shared read-only float32 amplitude modulation ``1 + depth * sin(2*pi*frequency*t)``."""
+    envelope = np.sin(2 * np.pi * frequency * _t_array(sample_rate, samples))
+    envelope *= depth
+    envelope += 1
+    envelope = envelope.astype(DTYPE)
+    envelope.setflags(write=False)
+    return envelope
+
+
+@functools.lru_cache(maxsize=64)
+def _decay_curve(samples: int, rate: float) -> np.ndarray:
+    """Get the shared read-only float32 decay ``exp(-rate * i / samples)`` over a buffer."""
+    curve = np.exp(-rate * np.arange(samples, dtype=np.float64) / samples).astype(DTYPE)
+    curve.setflags(write=False)
+    return curve
+
+
+@functools.lru_cache(maxsize=128)
+def _exp_decay(rate: float, samples: int) -> np.ndarray:
+    """Get the shared read-only float32 impact decay ``exp(-rate * linspace(0, 1, samples))``."""
+    decay = np.exp(-rate * np.linspace(0, 1, samples)).astype(DTYPE)
+    decay.setflags(write=False)
+    return decay
+
+
+@functools.lru_cache(maxsize=16)
+def _unit_sweep(sample_rate: int, start_freq: float, end_freq: float, duration: float) -> np.ndarray:
+    """
+    Get a shared read-only float32 unit-amplitude linear frequency sweep with
+    50 ms fades at both ends (a pre-rendered clip for generate_sweep).
+    """
+    t = _t_array(sample_rate, int(sample_rate * duration))
+    # Linear frequency sweep - closed-form chirp phase, no running sum needed
+    sweep_rate = (end_freq - start_freq) / duration
+    phase = 2 * np.pi * t * (start_freq + 0.5 * sweep_rate * t)
+    sweep = np.empty(len(t), dtype=DTYPE)
+    np.sin(phase, out=sweep)
+    
+    # Add envelope to avoid clicks (50ms fade), only touching the faded ends
+    fade_samples = int(0.05 * sample_rate)
+    _apply_fades(sweep, fade_samples, fade_samples)
+    sweep.setflags(write=False)
+    return sweep
+
+
+@functools.lru_cache(maxsize=32)
+def _impact_templates(sample_rate: int, low_freq: float, high_freq: float, duration: float,
+                      decay_rate: float, bins: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get a pre-rendered table of unit-amplitude decaying impact tones.
+
+    Returns the ``bins`` frequencies spanning ``[low_freq, high_freq]`` and a
+    ``(bins, samples)`` float32 table whose row ``k`` is
+    ``sin(2*pi*freqs[k]*t) * exp(-decay_rate * linspace(0, 1, samples))``.
+    The table is shared between calls (left writeable only so the compiled
+    kernels accept it) and must never be modified.
+    """
+    samples = int(sample_rate * duration)
+    freqs = np.linspace(low_freq, high_freq, bins)
+    phase = 2 * np.pi * np.outer(freqs, _t_array(sample_rate, samples))
+    table = (np.sin(phase) * _exp_decay(decay_rate, samples)).astype(DTYPE)
+    return freqs, table
+
+
+def _template_rows(freqs: np.ndarray, values) -> np.ndarray:
+    """Get the index of the nearest template frequency for each requested frequency."""
+    values = np.atleast_1d(values)
+    return np.abs(values[:, np.newaxis] - freqs).argmin(axis=1).astype(np.int64)
+
+
+class _BufferPool:
+    """
+    Free lists of zeroed audio buffers keyed by length, so repeated sounds
+    reuse memory instead of allocating a fresh buffer on every call.
+    """
+    
+    def __init__(self, dtype=DTYPE, max_buffers: int = 16):
+        self.dtype = dtype
+        self.max_buffers = max_buffers
+        self._bins: "collections.OrderedDict[int, list]" = collections.OrderedDict()
+        self._count = 0
+    
+    def get(self, samples: int) -> np.ndarray:
+        """Get a zeroed buffer of ``samples`` length."""
+        free = self._bins.get(samples)
+        if not free:
+            return np.zeros(samples, dtype=self.dtype)
+        
+        self._count -= 1
+        buffer = free.pop()
+        if not free:
+            del self._bins[samples]
+        return buffer
+    
+    def put(self, buffer: np.ndarray):
+        """
+        Give back a buffer that is no longer referenced anywhere else.
+        It is zeroed for its next use; the least recently used sizes are
+        dropped once more than ``max_buffers`` are held.
+        """
+        if buffer.dtype != self.dtype or buffer.base is not None:
+            return  # Only whole buffers allocated with the pool's precision
+        
+        buffer.fill(0)
+        self._bins.setdefault(len(buffer), []).append(buffer)
+        self._bins.move_to_end(len(buffer))
+        self._count += 1
+        
+        while self._count > self.max_buffers:
+            oldest = next(iter(self._bins))
+            free = self._bins[oldest]
+            free.pop(0)
+            self._count -= 1
+            if not free:
+                del self._bins[oldest]
+
 
 class MetroSoundSimulator:
     """Simulates realistic metro/subway sounds with random events and AI-enhanced generation."""
@@ -43,15 +258,17 @@ class MetroSoundSimulator:
             enable_ai: Enable AI-enhanced sound generation (default: True)
         """
         self.sample_rate = sample_rate
+        self.dtype = DTYPE  # Audio buffer precision
+        self.rng = np.random.default_rng()  # Shared generator for all per-sound random draws
         self.is_running = False
         self.enable_ai = enable_ai
         
         # Initialize AI components
         if self.enable_ai:
-            self.ai_noise_generator = IntelligentNoiseGenerator(sample_rate)
+            self.ai_noise_generator = IntelligentNoiseGenerator(sample_rate, self.rng)
             self.ai_frequency_modulator = ContextAwareFrequencyModulator()
             self.ai_evolution = AdaptiveSoundEvolution()
-            self.ai_event_predictor = IntelligentEventPredictor()
+            self.ai_event_predictor = IntelligentEventPredictor(self.rng)
             self.ai_parameter_learner = AIParameterLearner()
             
             # Initialize journey context
@@ -77,7 +294,87 @@ class MetroSoundSimulator:
             self.ai_parameter_learner = None
             self.context = None
         
-    def generate_tone(self, frequency: float, duration: float, amplitude: float = 0.3) -> np.ndarray:
+        # Persistent output stream fed by a bounded queue (opened on first playback)
+        self._stream = None
+        self._audio_queue = queue.Queue(maxsize=1)
+        self._current_audio = None
+        self._current_done = None
+        self._current_pos = 0
+        self._last_done = threading.Event()
+        self._last_done.set()
+        self._queued_samples = 0  # Total audio handed to playback (the journey clock)
+        
+        # Reusable scratch buffer for short-lived intermediates (never returned),
+        # allocated on first use
+        self._scratch = np.empty(0, dtype=self.dtype)
+        
+        # Pool of zeroed output buffers for generators whose results get mixed and released
+        self._pool = _BufferPool(self.dtype)
+        
+        # Worker threads for rendering independent layers of one sound concurrently
+        # (NumPy and the kernels release the GIL). Jobs on either pool must only reach
+        # serial kernels: Numba's workqueue layer aborts on concurrent parallel launches.
+        # Shut down by close().
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        
+        # Single worker that renders the next segment while the current one plays
+        self._prefetch = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        
+        # Sample counts of the fixed fades, pauses and offsets, in milliseconds (integer math)
+        self._ms = {ms: ms * sample_rate // 1000
+                    for ms in (2, 3, 5, 10, 50, 80, 100, 120, 150, 200, 300, 370, 500)}
+        
+        # Door warning chime: three faded 800 Hz beeps 120 ms apart, rendered once
+        beep = self.generate_tone(800, 0.18, amplitude=0.22)
+        beep *= _fade_ramp(len(beep), 1.0, 0.3)
+        gap = np.zeros(self._ms[120], dtype=self.dtype)
+        self._door_chime = np.concatenate([beep, gap, beep, gap, beep])
+        self._door_chime.setflags(write=False)
+        
+        # Station relay click (short 800 Hz tick), rendered once
+        self._relay_click = self.generate_tone(800, 0.02, amplitude=0.15)
+        self._relay_click.setflags(write=False)
+        
+        # Pre-rolled track variation (1 +/- 0.02 uniform jitter), read cyclically from random offsets
+        self._variation_slab = 0.98 + 0.04 * self.rng.random(8 * sample_rate, dtype=self.dtype)
+        
+    def _variation_noise(self, samples: int) -> np.ndarray:
+        """
+        Copy pre-rolled track variation starting at a random offset, wrapping around.
+        
+        Args:
+            samples: Number of samples to copy
+            
+        Returns:
+            New buffer of ``samples`` variation factors around 1
+        """
+        slab = self._variation_slab
+        start = int(self.rng.integers(len(slab)))
+        noise = np.empty(samples, dtype=self.dtype)
+        filled = 0
+        while filled < samples:
+            chunk = slab[start:start + samples - filled]
+            noise[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+            start = 0
+        return noise
+    
+    def _scratch_slice(self, samples: int) -> np.ndarray:
+        """
+        Get a view of the reusable scratch buffer, growing it if too short.
+        
+        Args:
+            samples: Number of samples needed
+            
+        Returns:
+            Scratch view of length ``samples`` (contents are undefined)
+        """
+        if len(self._scratch) < samples:
+            self._scratch = np.empty(samples, dtype=self.dtype)
+        return self._scratch[:samples]
+    
+    def generate_tone(self, frequency: float, duration: float, amplitude: float = 0.3,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Generate a simple sine wave tone.
         
@@ -85,13 +382,20 @@ class MetroSoundSimulator:
             frequency: Frequency in Hz
             duration: Duration in seconds
             amplitude: Volume level (0.0 to 1.0)
+            out: Optional buffer of the tone's length to render into (e.g. from the buffer pool)
             
         Returns:
-            Audio samples as numpy array
+            Audio samples as numpy array (``out`` if given)
         """
-        t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-        tone = amplitude * np.sin(2 * np.pi * frequency * t)
-        return tone
+        samples = int(self.sample_rate * duration)
+        if NUMBA_AVAILABLE:
+            # Table gather and scaling in one compiled pass, no phase array
+            tone = np.empty(samples, dtype=self.dtype) if out is None else out
+            render_tone(tone, frequency * SINE_TABLE_SIZE / self.sample_rate, amplitude)
+            return tone
+        
+        tone = _lut_sines(frequency, samples, self.sample_rate)
+        return np.multiply(tone, amplitude, out=tone if out is None else out)
     
     def generate_noise(self, duration: float, amplitude: float = 0.1, 
                        low_freq: float = 50, high_freq: float = 200) -> np.ndarray:
@@ -113,26 +417,52 @@ class MetroSoundSimulator:
             noise = self.ai_noise_generator.generate_intelligent_noise(
                 duration, amplitude, self.context
             )
-            # Apply frequency filtering
-            window_size = int(self.sample_rate / high_freq)
-            if window_size > 1:
-                noise = np.convolve(noise, np.ones(window_size)/window_size, mode='same')
-            return noise
-        
-        # Fallback to standard noise generation
+            # Apply frequency filtering, unless the generator already band-limits its output.
+            # Bands reaching above the generator's own low-pass (rain damping) would mostly
+            # keep the filter's leakage (18-20 dB down for the air hiss bands), so that noise
+            # is passed through as the generator damped it.
+            lowpass_cutoff = getattr(self.ai_noise_generator, 'lowpass_cutoff', None)
+            cutoff = lowpass_cutoff(self.context) if lowpass_cutoff else None
+            if (getattr(self.ai_noise_generator, 'needs_postfilter', True)
+                    and (cutoff is None or high_freq <= cutoff)):
+                # The generator hands back a fresh buffer, so filter it in place
+                noise = np.ascontiguousarray(noise, dtype=self.dtype)
+                return self._band_limit(noise, low_freq, high_freq)
+            return noise.astype(self.dtype, copy=False)
+        
+        # Fallback to standard noise generation: band-limited noise synthesized
+        # directly in the frequency domain (one inverse FFT, no filtering pass)
         samples = int(self.sample_rate * duration)
-        # Generate white noise
-        noise = np.random.normal(0, amplitude, samples)
+        return spectral_noise(samples, amplitude, low_freq, high_freq, self.sample_rate, self.dtype, self.rng)
+    
+    def _band_limit(self, noise: np.ndarray, low_freq: float, high_freq: float) -> np.ndarray:
+        """
+        Restrict AI-generated noise to a frequency band.
+        
+        Uses a cached 2nd-order Butterworth band-pass when scipy is available
+        (filtering ``noise`` in place when Numba is installed), otherwise a
+        moving-average low-pass at ``high_freq``.
+        
+        Args:
+            noise: White noise samples
+            low_freq: Low frequency cutoff in Hz
+            high_freq: High frequency cutoff in Hz
+            
+        Returns:
+            Filtered noise samples
+        """
+        if SCIPY_AVAILABLE:
+            return bandpass_filter(noise, low_freq, high_freq, self.sample_rate, inplace=True)
         
-        # Simple low-pass filtering by averaging to simulate rumble
+        # Simple low-pass filtering by averaging (running-sum boxcar) to simulate rumble
         window_size = int(self.sample_rate / high_freq)
         if window_size > 1:
-            noise = np.convolve(noise, np.ones(window_size)/window_size, mode='same')
-        
+            noise = moving_average(noise, window_size)
         return noise
     
     def generate_sweep(self, start_freq: float, end_freq: float, 
-                       duration: float, amplitude: float = 0.4) -> np.ndarray:
+                       duration: float, amplitude: float = 0.4,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Generate a frequency sweep (for screeching sounds).
         
@@ -141,23 +471,25 @@ class MetroSoundSimulator:
             end_freq: Ending frequency in Hz
             duration: Duration in seconds
             amplitude: Volume level
+            out: Optional buffer of the sweep's length to render into (e.g. from the buffer pool)
             
         Returns:
-            Audio samples as numpy array
+            Audio samples as numpy array (``out`` if given)
         """
-        t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-        # Linear frequency sweep
-        freq = np.linspace(start_freq, end_freq, len(t))
-        phase = 2 * np.pi * np.cumsum(freq) / self.sample_rate
-        sweep = amplitude * np.sin(phase)
-        
-        # Add envelope to avoid clicks
-        envelope = np.ones_like(sweep)
-        fade_samples = int(0.05 * self.sample_rate)  # 50ms fade
-        envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-        envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
-        
-        return sweep * envelope
+        if NUMBA_AVAILABLE:
+            # Chirp phase, table gather and 50 ms fades in one compiled pass
+            samples = int(self.sample_rate * duration)
+            sweep = np.empty(samples, dtype=self.dtype) if out is None else out
+            start_step = start_freq * SINE_TABLE_SIZE / self.sample_rate
+            sweep_step = (end_freq - start_freq) / duration * SINE_TABLE_SIZE / self.sample_rate ** 2
+            render_sweep(sweep, start_step, sweep_step, self._ms[50], amplitude)
+            return sweep
+        
+        # Sweeps are deterministic, so repeated ones are scaled copies of a pre-rendered clip
+        clip = _unit_sweep(self.sample_rate, start_freq, end_freq, duration)
+        sweep = np.empty(len(clip), dtype=self.dtype) if out is None else out
+        np.multiply(clip, amplitude, out=sweep)
+        return sweep
     
     def generate_compressed_air_release(self, duration: float, amplitude: float = 0.25) -> np.ndarray:
         """
@@ -174,14 +506,15 @@ class MetroSoundSimulator:
         samples = int(self.sample_rate * duration)
         noise = self.generate_noise(duration, amplitude=amplitude, low_freq=3000, high_freq=10000)
         
-        # Apply exponential decay envelope for realistic air release
-        t = np.linspace(0, duration, samples, False)
-        decay = np.exp(-2 * t / duration)  # Exponential decay
+        # Apply exponential decay envelope for realistic air release (cached per length)
+        np.multiply(noise, _decay_curve(samples, 2.0), out=noise)
         
-        # Add some turbulence variation
-        turbulence = 1 + 0.15 * np.random.normal(0, 1, samples)
-        
-        return noise * decay * turbulence
+        # Add some turbulence variation, built in place from one normal draw
+        turbulence = self.rng.standard_normal(samples, dtype=np.float32)
+        turbulence *= 0.15
+        turbulence += 1
+        np.multiply(noise, turbulence, out=noise)
+        return noise
     
     def generate_electric_motor_whine(self, duration: float, start_freq: float = 300, 
                                       end_freq: float = 800, amplitude: float = 0.15) -> np.ndarray:
@@ -215,31 +548,44 @@ class MetroSoundSimulator:
                 end_freq, 'motor', self.context
             )
         
-        # Electric motor produces harmonically rich sound
-        fundamental = self.generate_sweep(start_freq, end_freq, duration, amplitude)
-        
-        # Add harmonics for more realistic electric motor sound
-        harmonic2 = self.generate_sweep(start_freq * 2, end_freq * 2, duration, amplitude * 0.3)
-        harmonic3 = self.generate_sweep(start_freq * 3, end_freq * 3, duration, amplitude * 0.15)
-        
-        # Combine with slight phase differences
-        samples = len(fundamental)
-        combined = np.zeros(samples)
-        combined += fundamental
-        combined[:min(len(harmonic2), samples)] += harmonic2[:min(len(harmonic2), samples)]
-        combined[:min(len(harmonic3), samples)] += harmonic3[:min(len(harmonic3), samples)]
+        # Electric motor produces harmonically rich sound: the fundamental sweep plus
+        # 2nd and 3rd harmonics, which share one chirp phase (harmonic k is k * phase)
+        samples = int(self.sample_rate * duration)
+        sweep_rate = (end_freq - start_freq) / duration
+        fade_samples = self._ms[50]  # One envelope for all harmonics to avoid clicks
         
         # Add slight PWM (inverter) modulation characteristic of modern electric trains
-        t = np.linspace(0, duration, samples, False)
-        pwm_freq = random.uniform(4000, 6000)  # Inverter switching frequency
-        pwm_modulation = 1 + 0.03 * np.sin(2 * np.pi * pwm_freq * t)
+        pwm_freq = self.rng.uniform(4000, 6000)  # Inverter switching frequency
         
         # Apply AI evolution effects if enabled
         if self.enable_ai and self.ai_evolution:
-            temp_mod = self.ai_evolution.get_temperature_modulation()
-            combined = combined * temp_mod
+            amplitude *= self.ai_evolution.get_temperature_modulation()
+        
+        if NUMBA_AVAILABLE:
+            # Harmonics, fades and PWM gathered from the sine table in one compiled pass
+            combined = np.empty(samples, dtype=self.dtype)
+            step = SINE_TABLE_SIZE / self.sample_rate
+            render_motor_whine(combined, start_freq * step, sweep_rate * step / self.sample_rate,
+                               pwm_freq * step, fade_samples, amplitude)
+            return combined
         
-        return combined * pwm_modulation
+        t = _t_array(self.sample_rate, samples)
+        phase = 2 * np.pi * t * (start_freq + 0.5 * sweep_rate * t)
+        combined = np.empty(samples, dtype=self.dtype)
+        np.sin(phase, out=combined)
+        combined += 0.3 * np.sin(2 * phase)
+        combined += 0.15 * np.sin(3 * phase)
+        combined *= amplitude
+        _apply_fades(combined, fade_samples, fade_samples)
+        
+        if NUMEXPR_AVAILABLE:
+            # One fused pass, no temporaries
+            ne.evaluate("combined * (1 + 0.03 * sin(w_pwm * t))",
+                        local_dict={'combined': combined, 't': t, 'w_pwm': 2 * np.pi * pwm_freq},
+                        out=combined, casting='same_kind')
+        else:
+            combined *= 1 + 0.03 * np.sin(2 * np.pi * pwm_freq * t)
+        return combined
     
     def generate_inverter_sound(self, duration: float = 0.5, amplitude: float = 0.1) -> np.ndarray:
         """
@@ -253,15 +599,12 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         # High frequency carrier from IGBT/MOSFET switching
-        carrier_freq = random.uniform(4000, 8000)
+        carrier_freq = self.rng.uniform(4000, 8000)
         carrier = self.generate_tone(carrier_freq, duration, amplitude * 0.3)
         
-        # Modulation at lower frequency
-        samples = len(carrier)
-        t = np.linspace(0, duration, samples, False)
-        modulation = 1 + 0.5 * np.sin(2 * np.pi * 120 * t)  # 120 Hz modulation
-        
-        return carrier * modulation
+        # Modulation at lower frequency (120 Hz, same for every carrier of this length)
+        carrier *= _am_envelope(self.sample_rate, len(carrier), 120, 0.5)
+        return carrier
     
     def generate_wheel_flange_squeal(self, duration: float = 1.5, amplitude: float = 0.35) -> np.ndarray:
         """
@@ -275,35 +618,39 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
+        t = _t_array(self.sample_rate, samples)
         
         # High-pitched metallic squeal - multiple frequency components
-        squeal1 = self.generate_sweep(1200, 1800, duration, amplitude * 0.6)
-        squeal2 = self.generate_sweep(900, 1500, duration, amplitude * 0.4)
-        squeal3 = self.generate_sweep(1500, 2200, duration, amplitude * 0.3)
+        # (rendered concurrently with the grinding noise below)
+        # (the two mixed-in sweeps render into pooled buffers, taken and released on this thread)
+        squeal1 = self._executor.submit(self.generate_sweep, 1200, 1800, duration, amplitude * 0.6)
+        squeal2 = self._executor.submit(self.generate_sweep, 900, 1500, duration, amplitude * 0.4,
+                                        self._pool.get(samples))
+        squeal3 = self._executor.submit(self.generate_sweep, 1500, 2200, duration, amplitude * 0.3,
+                                        self._pool.get(samples))
         
         # Add irregular pulsing for realistic flange contact
-        pulse_freq = random.uniform(6, 12)  # Pulsing at 6-12 Hz
-        pulse_modulation = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * pulse_freq * t))
-        
-        # Combine squeals with pulsing
-        combined = np.zeros(samples)
-        combined[:len(squeal1)] += squeal1
-        combined[:len(squeal2)] += squeal2
-        combined[:len(squeal3)] += squeal3
-        combined = combined * pulse_modulation
+        # (drawn before the noise job starts so seeded runs stay reproducible)
+        pulse_freq = self.rng.uniform(6, 12)  # Pulsing at 6-12 Hz
         
         # Add some grinding noise component
-        grinding = self.generate_noise(duration, amplitude * 0.2, low_freq=600, high_freq=3000)
-        combined[:len(grinding)] += grinding
+        grinding = self._executor.submit(self.generate_noise, duration, amplitude * 0.2,
+                                         low_freq=600, high_freq=3000)
         
-        # Apply envelope for realistic onset/release
-        envelope = np.ones(samples)
-        fade_samples = int(0.2 * self.sample_rate)
-        envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-        envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
+        # Rectified-sine pulsing via sin^2 = (1 - cos(2x)) / 2: one cos, no abs pass
+        pulse_modulation = 0.75 - 0.25 * np.cos(4 * np.pi * pulse_freq * t)
         
-        return combined * envelope
+        # Combine squeals with pulsing (all sweeps are exactly samples long, mix into the first)
+        combined = squeal1.result()
+        for squeal in (squeal2.result(), squeal3.result()):
+            combined += squeal
+            self._pool.put(squeal)
+        combined *= pulse_modulation
+        combined += grinding.result()
+        
+        # Apply envelope for realistic onset/release
+        fade_samples = self._ms[200]
+        return _apply_fades(combined, fade_samples, fade_samples)
     
     def generate_rail_joint_clicks(self, duration: float, interval: float = 0.8, 
                                    amplitude: float = 0.15) -> np.ndarray:
@@ -319,37 +666,39 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        combined = np.zeros(samples)
-        
-        # Generate clicks at regular intervals
-        t = 0
-        while t < duration:
-            click_pos = int(t * self.sample_rate)
-            if click_pos < samples:
-                # Each click is a short percussive sound - two-part for realism
-                # First part: sharp metallic click
-                click_duration = 0.02  # 20ms
-                click1 = self.generate_tone(1200, click_duration, amplitude * 0.8)
-                click1_envelope = np.exp(-50 * np.linspace(0, 1, len(click1)))
-                click1 = click1 * click1_envelope
-                
-                # Second part: lower resonance
-                click2 = self.generate_tone(450, click_duration * 1.5, amplitude * 0.5)
-                click2_envelope = np.exp(-30 * np.linspace(0, 1, len(click2)))
-                click2 = click2 * click2_envelope
-                
-                # Add both parts with slight offset
+        combined = self._pool.get(samples)
+        
+        # Click times: slightly jittered intervals (rail segment length/speed), all drawn at once
+        max_clicks = int(duration / (interval * 0.95)) + 1
+        jitter = self.rng.uniform(0.95, 1.05, max_clicks)
+        click_times = np.concatenate(([0.0], np.cumsum(interval * jitter[:-1])))
+        positions = (click_times * self.sample_rate).astype(np.int64)
+        positions = positions[positions < samples]
+        
+        # Each click is a short percussive sound - two-part for realism,
+        # scaled from cached single-row impact templates
+        # First part: sharp metallic click
+        click_duration = 0.02  # 20ms
+        _, click1 = _impact_templates(self.sample_rate, 1200, 1200, click_duration, 50, bins=1)
+        click1 = (amplitude * 0.8) * click1[0]
+        
+        # Second part: lower resonance
+        _, click2 = _impact_templates(self.sample_rate, 450, 450, click_duration * 1.5, 30, bins=1)
+        click2 = (amplitude * 0.5) * click2[0]
+        
+        # Add both parts with slight offset at every click position
+        offset = self._ms[5]  # 5ms offset
+        if NUMBA_AVAILABLE:
+            scatter_clicks(combined, positions, click1, click2, offset)
+        else:
+            for click_pos in positions:
                 end_pos1 = min(click_pos + len(click1), samples)
                 combined[click_pos:end_pos1] += click1[:end_pos1 - click_pos]
                 
-                offset = int(0.005 * self.sample_rate)  # 5ms offset
                 click_pos2 = click_pos + offset
-                end_pos2 = min(click_pos2 + len(click2), samples)
                 if click_pos2 < samples:
+                    end_pos2 = min(click_pos2 + len(click2), samples)
                     combined[click_pos2:end_pos2] += click2[:end_pos2 - click_pos2]
-            
-            # Add slight randomness to interval for realism
-            t += interval * random.uniform(0.95, 1.05)
         
         return combined
     
@@ -365,33 +714,36 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
+        t = _t_array(self.sample_rate, samples)
         
         # High-frequency squeal from brake pad resonance
-        squeal_freq = random.uniform(2500, 4000)  # Typical brake squeal frequency
+        squeal_freq = self.rng.uniform(2500, 4000)  # Typical brake squeal frequency
         squeal = self.generate_tone(squeal_freq, duration, amplitude)
         
         # Add frequency modulation for realistic brake squeal character
-        modulation_freq = random.uniform(8, 15)  # Wobble in the squeal
-        freq_mod = 1 + 0.05 * np.sin(2 * np.pi * modulation_freq * t)
-        squeal = squeal * freq_mod
+        modulation_freq = self.rng.uniform(8, 15)  # Wobble in the squeal
         
         # Add harmonics
         harmonic2 = self.generate_tone(squeal_freq * 1.5, duration, amplitude * 0.3)
-        squeal[:len(harmonic2)] += harmonic2
         
-        # Apply amplitude modulation (squeal often pulsates)
-        amp_modulation = 0.6 + 0.4 * np.abs(np.sin(2 * np.pi * 3 * t))
-        squeal = squeal * amp_modulation
+        # Wobble the squeal, add the harmonic, then apply amplitude modulation
+        # (squeal often pulsates, 3 Hz sin^2 pulsing)
+        if NUMEXPR_AVAILABLE:
+            ne.evaluate("(squeal * (1 + 0.05 * sin(w_mod * t)) + harmonic2) * (0.8 - 0.2 * cos(w_pulse * t))",
+                        local_dict={'squeal': squeal, 'harmonic2': harmonic2, 't': t,
+                                    'w_mod': 2 * np.pi * modulation_freq, 'w_pulse': 4 * np.pi * 3},
+                        out=squeal, casting='same_kind')
+        else:
+            squeal *= 1 + 0.05 * np.sin(2 * np.pi * modulation_freq * t)
+            squeal += harmonic2
+            squeal *= 0.8 - 0.2 * np.cos(4 * np.pi * 3 * t)
         
-        # Apply envelope
-        envelope = np.ones(samples)
-        fade_in = int(0.15 * self.sample_rate)
-        fade_out = int(0.2 * self.sample_rate)
-        envelope[:fade_in] = np.linspace(0, 1, fade_in)
-        envelope[-fade_out:] = np.linspace(1, 0, fade_out)
+        # Apply envelope to the faded ends only
+        fade_in = self._ms[150]
+        fade_out = self._ms[200]
+        _apply_fades(squeal, fade_in, fade_out)
         
-        return squeal * envelope
+        return squeal
     
     def generate_low_speed_grinding(self, duration: float = 1.0, amplitude: float = 0.18) -> np.ndarray:
         """
@@ -405,7 +757,7 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
+        t = _t_array(self.sample_rate, samples)
         
         # Low-frequency grinding from slow wheel rotation
         grind1 = self.generate_sweep(150, 300, duration, amplitude * 0.5)
@@ -418,11 +770,10 @@ class MetroSoundSimulator:
         rotation_freq = 2.5  # ~2.5 Hz rotation at low speed
         rotation_pattern = 1 + 0.3 * np.sin(2 * np.pi * rotation_freq * t)
         
-        combined = np.zeros(samples)
-        combined[:len(grind1)] += grind1
-        combined[:len(grind2)] += grind2
-        combined[:len(roughness)] += roughness
-        combined = combined * rotation_pattern
+        combined = grind1
+        combined += grind2
+        combined += roughness
+        combined *= rotation_pattern
         
         return combined
     
@@ -443,21 +794,21 @@ class MetroSoundSimulator:
         slip_squeal = self.generate_sweep(800, 1500, duration, amplitude * 0.7)
         
         # Add rapid frequency modulation for spinning effect
-        t = np.linspace(0, duration, samples, False)
+        t = _t_array(self.sample_rate, samples)
         spin_mod = 1 + 0.15 * np.sin(2 * np.pi * 30 * t)  # Rapid modulation
-        slip_squeal = slip_squeal * spin_mod
+        slip_squeal *= spin_mod
         
         # Add some grinding noise
         grinding = self.generate_noise(duration, amplitude * 0.4, low_freq=300, high_freq=1500)
         
-        combined = np.zeros(samples)
-        combined[:len(slip_squeal)] += slip_squeal
-        combined[:len(grinding)] += grinding
+        combined = slip_squeal
+        combined += grinding
         
         # Sharp attack and quick decay
-        envelope = np.exp(-3 * np.linspace(0, 1, samples))
+        envelope = _exp_decay(3, samples)
         
-        return combined * envelope
+        combined *= envelope
+        return combined
     
     def generate_rail_switch(self, duration: float = 1.2, amplitude: float = 0.25) -> np.ndarray:
         """
@@ -476,97 +827,106 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        combined = np.zeros(samples)
-        
-        # Main sequence: front bogie hits switch, then rear bogie
-        # Front bogie crossing (first set of impacts)
-        t1 = 0.0
-        for i in range(2):  # Two wheels per bogie (left and right)
-            click_pos = int(t1 * self.sample_rate)
-            if click_pos < samples:
-                # Sharp metallic click from wheel hitting gap/frog
-                click_freq = random.uniform(1800, 2400)
-                click_duration = 0.015
-                click = self.generate_tone(click_freq, click_duration, amplitude * 0.9)
-                click_envelope = np.exp(-80 * np.linspace(0, 1, len(click)))
-                click = click * click_envelope
-                
-                # Add metallic ringing
-                ring = self.generate_tone(click_freq * 1.5, 0.05, amplitude * 0.4)
-                ring_envelope = np.exp(-40 * np.linspace(0, 1, len(ring)))
-                ring = ring * ring_envelope
-                
-                # Add low-frequency clunk from impact
-                clunk = self.generate_tone(280, 0.03, amplitude * 0.6)
-                clunk_envelope = np.exp(-50 * np.linspace(0, 1, len(clunk)))
-                clunk = clunk * clunk_envelope
-                
-                # Combine all parts
-                end_pos = min(click_pos + len(click), samples)
-                combined[click_pos:end_pos] += click[:end_pos - click_pos]
-                
-                ring_pos = click_pos + int(0.005 * self.sample_rate)
-                if ring_pos < samples:
-                    end_pos = min(ring_pos + len(ring), samples)
-                    combined[ring_pos:end_pos] += ring[:end_pos - ring_pos]
-                
-                clunk_pos = click_pos + int(0.002 * self.sample_rate)
-                if clunk_pos < samples:
-                    end_pos = min(clunk_pos + len(clunk), samples)
-                    combined[clunk_pos:end_pos] += clunk[:end_pos - clunk_pos]
-            
-            t1 += random.uniform(0.05, 0.08)  # Slight offset between left/right wheels
-        
-        # Rear bogie crossing (second set of impacts) - happens after bogie spacing delay
-        t2 = random.uniform(0.4, 0.5)  # Typical bogie spacing at cruising speed
-        for i in range(2):
-            click_pos = int(t2 * self.sample_rate)
-            if click_pos < samples:
-                # Similar pattern for rear wheels
-                click_freq = random.uniform(1700, 2300)
-                click_duration = 0.015
-                click = self.generate_tone(click_freq, click_duration, amplitude * 0.85)
-                click_envelope = np.exp(-80 * np.linspace(0, 1, len(click)))
-                click = click * click_envelope
-                
-                ring = self.generate_tone(click_freq * 1.5, 0.05, amplitude * 0.35)
-                ring_envelope = np.exp(-40 * np.linspace(0, 1, len(ring)))
-                ring = ring * ring_envelope
-                
-                clunk = self.generate_tone(270, 0.03, amplitude * 0.55)
-                clunk_envelope = np.exp(-50 * np.linspace(0, 1, len(clunk)))
-                clunk = clunk * clunk_envelope
-                
-                end_pos = min(click_pos + len(click), samples)
-                combined[click_pos:end_pos] += click[:end_pos - click_pos]
-                
-                ring_pos = click_pos + int(0.005 * self.sample_rate)
-                if ring_pos < samples:
-                    end_pos = min(ring_pos + len(ring), samples)
-                    combined[ring_pos:end_pos] += ring[:end_pos - ring_pos]
-                
-                clunk_pos = click_pos + int(0.002 * self.sample_rate)
-                if clunk_pos < samples:
-                    end_pos = min(clunk_pos + len(clunk), samples)
-                    combined[clunk_pos:end_pos] += clunk[:end_pos - clunk_pos]
-            
-            t2 += random.uniform(0.05, 0.08)
+        combined = self._pool.get(samples)
+        
+        # Main sequence: front bogie hits switch, then rear bogie.
+        # Each entry: (start time, click freq range, click/ring/clunk amplitudes, clunk freq)
+        bogies = [
+            # Front bogie crossing (first set of impacts)
+            (0.0, (1800, 2400), (0.9, 0.4, 0.6), 280),
+            # Rear bogie crossing - happens after bogie spacing delay at cruising speed
+            (self.rng.uniform(0.4, 0.5), (1700, 2300), (0.85, 0.35, 0.55), 270),
+        ]
+        # Slight offset between left/right wheels and click pitches, drawn for all four wheels at once
+        wheel_offsets = self.rng.uniform(0.05, 0.08, size=(len(bogies), 2))
+        freq_ranges = np.array([freq_range for _, freq_range, _, _ in bogies])
+        click_freqs = self.rng.uniform(freq_ranges[:, :1], freq_ranges[:, 1:], size=(len(bogies), 2))
+        
+        # Switch mechanism rattle and crossing rumble render on a worker while the impacts
+        # are added (in one job, so their random draws keep a fixed order)
+        rumble_duration = min(0.8, duration)
+        noise_layers = self._executor.submit(lambda: (
+            self.generate_noise(0.3, amplitude * 0.2, low_freq=400, high_freq=1200),
+            self.generate_noise(rumble_duration, amplitude * 0.15, low_freq=60, high_freq=200)
+        ))
+        
+        # Each wheel hitting the gap/frog gives a sharp metallic click, ringing 5 ms later
+        # and a low clunk from the impact 2 ms later, all looked up from template tables
+        starts, wheel_click_freqs, clunk_freqs, gains = [], [], [], []
+        for bogie, (t, _, bogie_gains, clunk_freq) in enumerate(bogies):
+            for i in range(2):  # Two wheels per bogie (left and right)
+                click_pos = int(t * self.sample_rate)
+                if click_pos < samples:
+                    starts.append(click_pos)
+                    wheel_click_freqs.append(click_freqs[bogie, i])
+                    clunk_freqs.append(clunk_freq)
+                    gains.append(bogie_gains)
+                t += wheel_offsets[bogie, i]
+        
+        starts = np.array(starts, dtype=np.int64)
+        gains = amplitude * np.array(gains, dtype=np.float64).reshape(-1, 3)
+        click_table_freqs, click_tpls = _impact_templates(self.sample_rate, 1700, 2400, 0.015, 80)
+        _, ring_tpls = _impact_templates(self.sample_rate, 1700 * 1.5, 2400 * 1.5, 0.05, 40)
+        clunk_table_freqs, clunk_tpls = _impact_templates(self.sample_rate, 270, 280, 0.03, 50, bins=2)
+        click_rows = _template_rows(click_table_freqs, wheel_click_freqs)
+        
+        self._scatter_templates(combined, starts, click_rows, gains[:, 0], click_tpls)
+        self._scatter_templates(combined, starts + self._ms[5],
+                                click_rows, gains[:, 1], ring_tpls)
+        self._scatter_templates(combined, starts + self._ms[2],
+                                _template_rows(clunk_table_freqs, clunk_freqs), gains[:, 2], clunk_tpls)
         
         # Add switch mechanism sounds - rattling from movable rails
-        switch_rattle = self.generate_noise(0.3, amplitude * 0.2, low_freq=400, high_freq=1200)
-        rattle_start = int(0.1 * self.sample_rate)
+        switch_rattle, rumble = noise_layers.result()
+        rattle_start = self._ms[100]
         rattle_end = min(rattle_start + len(switch_rattle), samples)
         combined[rattle_start:rattle_end] += switch_rattle[:rattle_end - rattle_start]
         
         # Add brief rumble increase during crossing
-        rumble_duration = min(0.8, duration)
-        rumble = self.generate_noise(rumble_duration, amplitude * 0.15, low_freq=60, high_freq=200)
-        rumble_start = int(0.05 * self.sample_rate)
+        rumble_start = self._ms[50]
         rumble_end = min(rumble_start + len(rumble), samples)
         combined[rumble_start:rumble_end] += rumble[:rumble_end - rumble_start]
         
         return combined
     
+    def _scatter_templates(self, combined: np.ndarray, positions: np.ndarray, rows: np.ndarray,
+                           gains: np.ndarray, templates: np.ndarray):
+        """
+        Add ``gains[k] * templates[rows[k]]`` into combined at each of ``positions``.
+        Uses the compiled scatter_templates kernel when Numba is available.
+        """
+        if NUMBA_AVAILABLE:
+            gains = np.ascontiguousarray(gains, dtype=np.float64)
+            scatter_templates(combined, positions, rows, gains, templates)
+            return
+        
+        samples = len(combined)
+        for pos, row, gain in zip(positions, rows, gains):
+            if pos < samples:
+                end_pos = min(pos + templates.shape[1], samples)
+                combined[pos:end_pos] += gain * templates[row, :end_pos - pos]
+    
+    def _mix_layers(self, samples: int, layers) -> np.ndarray:
+        """
+        Mix up to six (audio, start sample) layers into a new buffer of ``samples``.
+        Uses the compiled single-pass mix_layers kernel when Numba is available.
+        """
+        if NUMBA_AVAILABLE:
+            arrays = [np.ascontiguousarray(audio, dtype=self.dtype) for audio, _ in layers]
+            arrays += [np.empty(0, dtype=self.dtype)] * (6 - len(layers))
+            offsets = np.zeros(6, dtype=np.int64)
+            offsets[:len(layers)] = [start for _, start in layers]
+            combined = np.empty(samples, dtype=self.dtype)
+            mix_layers(combined, *arrays, offsets)
+            return combined
+        
+        combined = np.zeros(samples, dtype=self.dtype)
+        for audio, start in layers:
+            end = min(start + len(audio), samples)
+            if start < end:
+                combined[start:end] += audio[:end - start]
+        return combined
+    
     def generate_rail_defects(self, duration: float = 0.8, amplitude: float = 0.2) -> np.ndarray:
         """
         Generate rail defect sounds (imperfections in rails).
@@ -585,19 +945,19 @@ class MetroSoundSimulator:
             Audio samples as numpy array
         """
         samples = int(self.sample_rate * duration)
-        combined = np.zeros(samples)
-        t = np.linspace(0, duration, samples, False)
+        combined = self._pool.get(samples)
+        t = _t_array(self.sample_rate, samples)
         
         # Select random defect type
-        defect_type = random.choice(['corrugation', 'flat_spot', 'worn_joint', 'irregularity'])
+        defect_type = str(self.rng.choice(['corrugation', 'flat_spot', 'worn_joint', 'irregularity']))
         
         if defect_type == 'corrugation':
             # Corrugation causes regular rhythmic thumping
             # Frequency depends on speed and corrugation wavelength
-            thump_freq = random.uniform(8, 15)  # 8-15 Hz is typical
+            thump_freq = self.rng.uniform(8, 15)  # 8-15 Hz is typical
             
             # Generate rhythmic thumping pattern
-            thumps = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * thump_freq * t))
+            thumps = 0.75 - 0.25 * np.cos(4 * np.pi * thump_freq * t)  # sin^2 pulses
             
             # Low frequency impacts
             base_thump = self.generate_noise(duration, amplitude * 0.7, low_freq=80, high_freq=300)
@@ -610,55 +970,45 @@ class MetroSoundSimulator:
         elif defect_type == 'flat_spot':
             # Flat spot on wheel causes periodic loud impact
             # Calculate impacts per wheel revolution at speed
-            wheel_rpm = random.uniform(6, 12)  # RPM at typical metro speed
+            wheel_rpm = self.rng.uniform(6, 12)  # RPM at typical metro speed
             impact_interval = 60.0 / wheel_rpm  # Time between impacts
             
-            # Create sharp impacts at regular intervals
+            # Create sharp impacts at regular intervals (one per revolution, so they never overlap)
             num_impacts = int(duration / impact_interval)
-            for i in range(num_impacts):
-                impact_time = i * impact_interval + random.uniform(-0.02, 0.02)
-                impact_pos = int(impact_time * self.sample_rate)
-                
-                if impact_pos < samples:
-                    # Sharp thud from flat spot hitting rail
-                    thud_freq = random.uniform(200, 400)
-                    thud = self.generate_tone(thud_freq, 0.03, amplitude * 0.8)
-                    thud_envelope = np.exp(-60 * np.linspace(0, 1, len(thud)))
-                    thud = thud * thud_envelope
-                    
-                    # Add metallic ring
-                    ring = self.generate_tone(1200, 0.04, amplitude * 0.4)
-                    ring_envelope = np.exp(-40 * np.linspace(0, 1, len(ring)))
-                    ring = ring * ring_envelope
-                    
-                    end_pos = min(impact_pos + len(thud), samples)
-                    combined[impact_pos:end_pos] += thud[:end_pos - impact_pos]
-                    
-                    ring_pos = impact_pos + int(0.003 * self.sample_rate)
-                    if ring_pos < samples:
-                        end_pos = min(ring_pos + len(ring), samples)
-                        combined[ring_pos:end_pos] += ring[:end_pos - ring_pos]
+            impact_times = np.arange(num_impacts) * impact_interval + self.rng.uniform(-0.02, 0.02, num_impacts)
+            positions = (np.maximum(impact_times, 0.0) * self.sample_rate).astype(np.int64)
+            positions = positions[positions < samples]
+            # Sharp thud from flat spot hitting rail, pitch varying per impact
+            thud_freqs = self.rng.uniform(200, 400, len(positions))
+            
+            # Thud at each impact and a metallic 1200 Hz ring 3 ms later, from template tables
+            thud_table_freqs, thud_tpls = _impact_templates(self.sample_rate, 200, 400, 0.03, 60)
+            _, ring_tpls = _impact_templates(self.sample_rate, 1200, 1200, 0.04, 40, bins=1)
+            self._scatter_templates(combined, positions, _template_rows(thud_table_freqs, thud_freqs),
+                                    np.full(len(positions), amplitude * 0.8), thud_tpls)
+            self._scatter_templates(combined, positions + self._ms[3],
+                                    np.zeros(len(positions), dtype=np.int64),
+                                    np.full(len(positions), amplitude * 0.4), ring_tpls)
         
         elif defect_type == 'worn_joint':
             # Worn/damaged rail joint creates a louder, harsher click
             # Usually just one or two impacts
-            num_impacts = random.randint(2, 4)
+            num_impacts = self.rng.integers(2, 5)
             
             for i in range(num_impacts):
-                impact_time = random.uniform(0.1, duration - 0.1)
+                # (upper bound clamped: Generator.uniform rejects reversed bounds on short defects)
+                impact_time = self.rng.uniform(0.1, max(duration - 0.1, 0.1))
                 impact_pos = int(impact_time * self.sample_rate)
                 
                 if impact_pos < samples:
                     # Loud metallic clang from damaged joint
-                    clang_freq = random.uniform(1400, 2000)
-                    clang = self.generate_tone(clang_freq, 0.025, amplitude * 0.9)
-                    clang_envelope = np.exp(-70 * np.linspace(0, 1, len(clang)))
-                    clang = clang * clang_envelope
+                    clang_freq = self.rng.uniform(1400, 2000)
+                    clang_table_freqs, clang_tpls = _impact_templates(self.sample_rate, 1400, 2000, 0.025, 70)
+                    clang = amplitude * 0.9 * clang_tpls[_template_rows(clang_table_freqs, clang_freq)[0]]
                     
                     # Heavy bass thump from impact
-                    thump = self.generate_tone(150, 0.04, amplitude * 0.7)
-                    thump_envelope = np.exp(-45 * np.linspace(0, 1, len(thump)))
-                    thump = thump * thump_envelope
+                    _, thump_tpls = _impact_templates(self.sample_rate, 150, 150, 0.04, 45, bins=1)
+                    thump = amplitude * 0.7 * thump_tpls[0]
                     
                     # Prolonged ringing
                     ring_duration = 0.08
@@ -667,77 +1017,76 @@ class MetroSoundSimulator:
                     end_pos = min(impact_pos + len(clang), samples)
                     combined[impact_pos:end_pos] += clang[:end_pos - impact_pos]
                     
-                    thump_pos = impact_pos - int(0.002 * self.sample_rate)
+                    thump_pos = impact_pos - self._ms[2]
                     if thump_pos >= 0 and thump_pos < samples:
                         end_pos = min(thump_pos + len(thump), samples)
                         combined[thump_pos:end_pos] += thump[:end_pos - thump_pos]
                     
-                    ring_pos = impact_pos + int(0.01 * self.sample_rate)
+                    ring_pos = impact_pos + self._ms[10]
                     if ring_pos < samples:
                         end_pos = min(ring_pos + len(ring), samples)
                         combined[ring_pos:end_pos] += ring[:end_pos - ring_pos]
         
         else:  # 'irregularity'
             # Random track irregularities cause unpredictable bumps
-            num_bumps = random.randint(3, 8)
+            num_bumps = self.rng.integers(3, 9)
             
             # Place bumps away from edges to avoid fade-out issues
             safe_start = 0.15  # Start after 150ms
-            safe_end = duration - 0.15  # End before last 150ms
+            safe_end = max(duration - 0.15, safe_start)  # End before last 150ms (empty window on short defects)
+            
+            # Random bump characteristics: (duration, amplitude factor, freq range).
+            # Only these three lengths occur, so their decay envelopes always hit the cache.
+            bump_types = [
+                (0.02, 0.5, (300, 600)),   # small
+                (0.035, 0.7, (200, 500)),  # medium
+                (0.05, 0.9, (150, 400)),   # large
+            ]
+            
+            # Roll every bump at once: position, size and pitch
+            bump_positions = (self.rng.uniform(safe_start, safe_end, num_bumps) * self.sample_rate).astype(np.int64)
+            bump_sizes = self.rng.integers(len(bump_types), size=num_bumps)
+            freq_ranges = np.array([freq_range for _, _, freq_range in bump_types])
+            bump_freqs = self.rng.uniform(freq_ranges[bump_sizes, 0], freq_ranges[bump_sizes, 1])
             
-            for i in range(num_bumps):
-                bump_time = random.uniform(safe_start, safe_end)
-                bump_pos = int(bump_time * self.sample_rate)
+            # Synthesize each size class as one matrix of decaying tones plus roughness
+            # noise, then scatter all of its rows into the mix in one call
+            for size, (bump_duration, amp_factor, _) in enumerate(bump_types):
+                selected = (bump_sizes == size) & (bump_positions < samples)
+                count = int(np.count_nonzero(selected))
+                if count == 0:
+                    continue
                 
-                if bump_pos < samples:
-                    # Random bump characteristics
-                    bump_type = random.choice(['small', 'medium', 'large'])
-                    
-                    if bump_type == 'small':
-                        bump_duration = 0.02
-                        bump_amp = amplitude * 0.5
-                        bump_freq = random.uniform(300, 600)
-                    elif bump_type == 'medium':
-                        bump_duration = 0.035
-                        bump_amp = amplitude * 0.7
-                        bump_freq = random.uniform(200, 500)
-                    else:  # large
-                        bump_duration = 0.05
-                        bump_amp = amplitude * 0.9
-                        bump_freq = random.uniform(150, 400)
-                    
-                    bump = self.generate_tone(bump_freq, bump_duration, bump_amp)
-                    bump_envelope = np.exp(-40 * np.linspace(0, 1, len(bump)))
-                    bump = bump * bump_envelope
-                    
-                    # Add noise component for roughness
-                    noise = self.generate_noise(bump_duration, bump_amp * 0.6, low_freq=200, high_freq=1000)
-                    bump = bump + noise[:len(bump)]
-                    
-                    end_pos = min(bump_pos + len(bump), samples)
-                    combined[bump_pos:end_pos] += bump[:end_pos - bump_pos]
+                bump_amp = amplitude * amp_factor
+                n = int(bump_duration * self.sample_rate)
+                bumps = _lut_sines(bump_freqs[selected], n, self.sample_rate)
+                bumps *= _exp_decay(40, n)
+                bumps *= bump_amp
+                
+                # Add noise component for roughness, one stretch cut into a row per bump
+                noise = self.generate_noise((count * n + 1) / self.sample_rate, bump_amp * 0.6,
+                                            low_freq=200, high_freq=1000)
+                bumps += noise[:count * n].reshape(count, n)
+                
+                self._scatter_templates(combined, bump_positions[selected], np.arange(count, dtype=np.int64),
+                                        np.ones(count), bumps)
         
         # Apply overall envelope only if there's content
         # Check if we have actual sound content
         if np.max(np.abs(combined)) > 0.001:
-            envelope = np.ones(samples)
-            fade_samples = int(0.1 * self.sample_rate)
+            fade_samples = self._ms[100]
             if samples > 2 * fade_samples:
-                envelope[:fade_samples] = np.linspace(0.3, 1, fade_samples)
-                envelope[-fade_samples:] = np.linspace(1, 0.3, fade_samples)
-            
-            return combined * envelope
+                _apply_fades(combined, fade_samples, fade_samples, 0.3, 0.3)
+            return combined
         else:
             # If no content was generated, return a minimal defect sound
             # to ensure we always have some output
-            default_bump = self.generate_tone(250, 0.03, amplitude * 0.7)
-            default_bump_env = np.exp(-50 * np.linspace(0, 1, len(default_bump)))
-            default_bump = default_bump * default_bump_env
+            _, default_bump = _impact_templates(self.sample_rate, 250, 250, 0.03, 50, bins=1)
             
             # Place in middle
             mid_pos = samples // 2
-            end_pos = min(mid_pos + len(default_bump), samples)
-            combined[mid_pos:end_pos] += default_bump[:end_pos - mid_pos]
+            end_pos = min(mid_pos + default_bump.shape[1], samples)
+            combined[mid_pos:end_pos] += (amplitude * 0.7) * default_bump[0, :end_pos - mid_pos]
             
             return combined
 
@@ -745,19 +1094,98 @@ class MetroSoundSimulator:
         """
         Play audio through the default audio device.
         
+        Audio is queued on a persistent output stream so consecutive sounds play
+        back to back; only a full queue makes a non-blocking call wait.
+        
         Args:
             audio: Audio samples to play
             blocking: If True, wait for playback to complete
         """
+        self._queued_samples += len(audio)
         if AUDIO_AVAILABLE:
-            sd.play(audio, self.sample_rate)
+            self._start_stream()
+            done = threading.Event()
+            self._last_done = done
+            self._audio_queue.put((np.ascontiguousarray(audio, dtype=np.float32), done))
             if blocking:
-                sd.wait()
+                done.wait()
         else:
             # Simulate playback delay when audio is not available
             duration = len(audio) / self.sample_rate
-            if blocking:
-                time.sleep(duration)
+            time.sleep(duration)
+    
+    def wait_for_playback(self):
+        """Block until all queued audio has been played."""
+        self._last_done.wait()
+    
+    def pause(self, duration: float):
+        """
+        Queue silence so the next sound starts after a gap.
+        
+        Args:
+            duration: Length of the gap in seconds
+        """
+        self.play_sound(np.zeros(int(self.sample_rate * duration), dtype=self.dtype), blocking=False)
+    
+    def audio_time(self) -> float:
+        """Get the total duration of audio queued for playback so far, in seconds."""
+        return self._queued_samples / self.sample_rate
+    
+    def _start_stream(self):
+        """Open the persistent output stream on first use."""
+        if self._stream is None:
+            self._stream = sd.OutputStream(
+                samplerate=self.sample_rate, channels=1, dtype='float32',
+                callback=self._audio_callback
+            )
+            self._stream.start()
+    
+    def close(self):
+        """Stop playback and shut down the worker threads; the simulator cannot render afterwards."""
+        self._close_stream()
+        self._executor.shutdown(wait=True)
+        self._prefetch.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _close_stream(self):
+        """Stop the output stream and discard any audio still queued."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        while not self._audio_queue.empty():
+            _, done = self._audio_queue.get_nowait()
+            done.set()
+        if self._current_done is not None:
+            self._current_done.set()
+        self._current_audio = None
+    
+    def _audio_callback(self, outdata, frames, time_info, status):
+        """Fill the device buffer from queued audio, padding with silence on underrun."""
+        filled = 0
+        while filled < frames:
+            if self._current_audio is None:
+                try:
+                    self._current_audio, self._current_done = self._audio_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._current_pos = 0
+            
+            chunk = self._current_audio[self._current_pos:self._current_pos + frames - filled]
+            outdata[filled:filled + len(chunk), 0] = chunk
+            filled += len(chunk)
+            self._current_pos += len(chunk)
+            
+            if self._current_pos >= len(self._current_audio):
+                self._current_done.set()
+                self._current_audio = None
+        
+        outdata[filled:] = 0
     
     def ambient_rumble(self, duration: float = 3.0):
         """
@@ -771,24 +1199,31 @@ class MetroSoundSimulator:
         rumble = self.generate_noise(duration, amplitude=0.12, low_freq=40, high_freq=150)
         
         # Add multiple periodic vibrations for realism
-        t = np.linspace(0, duration, len(rumble), False)
+        samples = len(rumble)
         
-        # Primary track vibration at ~8 Hz
-        vibration1 = 0.04 * np.sin(2 * np.pi * 8 * t)
-        # Secondary harmonic at ~3 Hz for wheel rhythm
-        vibration2 = 0.03 * np.sin(2 * np.pi * 3 * t)
-        # Add slight random variation to simulate real track irregularities
-        variation = 1 + vibration1 + vibration2 + 0.02 * np.random.uniform(-1, 1, len(t))
-        
-        rumble = rumble * variation
+        if NUMBA_AVAILABLE:
+            # Track variation read straight from the pre-rolled slab and both
+            # vibrations applied in one compiled pass
+            start = int(self.rng.integers(len(self._variation_slab)))
+            modulate_rumble(rumble, self._variation_slab, start, self.sample_rate)
+        else:
+            # Slight random variation to simulate real track irregularities
+            variation = self._variation_noise(samples)
+            # Primary track vibration at ~8 Hz (gathered from the sine table)
+            variation += 0.04 * _lut_sines(8, samples, self.sample_rate)
+            # Secondary harmonic at ~3 Hz for wheel rhythm
+            variation += 0.03 * _lut_sines(3, samples, self.sample_rate)
+            
+            rumble *= variation
         
         # Add constant electric motor hum in background (more stable frequency)
+        # (tones are rendered into pooled buffers and released once mixed)
         motor_freq = random.uniform(450, 550)
-        motor_hum = self.generate_tone(motor_freq, duration, amplitude=0.08)
+        motor_hum = self.generate_tone(motor_freq, duration, amplitude=0.08, out=self._pool.get(samples))
         
         # Add second harmonic for richer motor sound
         motor_freq2 = motor_freq * 1.5
-        motor_hum2 = self.generate_tone(motor_freq2, duration, amplitude=0.04)
+        motor_hum2 = self.generate_tone(motor_freq2, duration, amplitude=0.04, out=self._pool.get(samples))
         
         # Slight inverter noise (less prominent for smoother sound)
         inverter_noise = self.generate_noise(duration, amplitude=0.03, low_freq=4000, high_freq=7000)
@@ -800,19 +1235,20 @@ class MetroSoundSimulator:
         speed_factor = random.uniform(0.7, 1.0)  # Simulates different speeds
         rail_clicks = self.generate_rail_joint_clicks(duration, interval=0.8 * speed_factor, amplitude=0.12)
         
-        combined = rumble + motor_hum + motor_hum2 + inverter_noise + rail_contact
+        # Mix everything into the rumble buffer
+        combined = rumble
+        for layer in (motor_hum, motor_hum2, inverter_noise, rail_contact):
+            combined += layer
         combined[:len(rail_clicks)] += rail_clicks
+        for layer in (motor_hum, motor_hum2, rail_clicks):
+            self._pool.put(layer)
         
         # Apply gentle fade in/out for smoother transitions
-        fade_samples = int(0.5 * self.sample_rate)  # 500ms fade
+        fade_samples = self._ms[500]  # 500ms fade
         if len(combined) > 2 * fade_samples:
-            fade_in = np.linspace(0.7, 1.0, fade_samples)
-            fade_out = np.linspace(1.0, 0.7, fade_samples)
-            combined[:fade_samples] *= fade_in
-            combined[-fade_samples:] *= fade_out
+            _apply_fades(combined, fade_samples, fade_samples, 0.7, 0.7)
         
         self.play_sound(combined, blocking=False)
-        time.sleep(duration)
     
     def turn_screech(self):
         """Generate and play a turn screeching sound (kept for backward compatibility)."""
@@ -825,7 +1261,7 @@ class MetroSoundSimulator:
         
         # Combine screeches
         max_len = max(len(screech1), len(screech2))
-        combined = np.zeros(max_len)
+        combined = np.zeros(max_len, dtype=self.dtype)
         combined[:len(screech1)] += screech1
         combined[:len(screech2)] += screech2
         
@@ -842,71 +1278,58 @@ class MetroSoundSimulator:
         """Generate a gentle curve sound without harsh screeching."""
         print("  🔄 Taking a gentle curve...")
         
-        # Subtle pitch change in motor
-        motor_sweep = self.generate_sweep(500, 600, duration, amplitude=0.10)
+        samples = int(self.sample_rate * duration)
+        
+        # Subtle pitch change in motor (sweeps go into pooled buffers, released once mixed)
+        motor_sweep = self.generate_sweep(500, 600, duration, amplitude=0.10, out=self._pool.get(samples))
         
         # Slight increase in rumble
         rumble = self.generate_noise(duration, amplitude=0.13, low_freq=40, high_freq=180)
         
         # Wheel-rail contact change (mild)
-        rail_sound = self.generate_sweep(700, 850, duration, amplitude=0.08)
+        rail_sound = self.generate_sweep(700, 850, duration, amplitude=0.08, out=self._pool.get(samples))
         
         # Add subtle wheel flange contact sound (not full squeal, just light contact)
         flange_contact = self.generate_noise(duration, amplitude=0.06, low_freq=900, high_freq=1500)
         
+        # Mix everything into the rumble buffer
+        combined = rumble
+        for layer in (motor_sweep, rail_sound, flange_contact):
+            combined += layer
+        self._pool.put(motor_sweep)
+        self._pool.put(rail_sound)
+        
         # Sometimes add a light flange squeal for tighter curves (30% chance)
         if random.random() < 0.3:
             squeal_duration = duration * 0.6  # Squeal for part of the curve
             flange_squeal = self.generate_wheel_flange_squeal(squeal_duration, amplitude=0.18)
             # Position squeal in middle of curve
             squeal_start = int((duration - squeal_duration) * 0.5 * self.sample_rate)
-            
-        combined = motor_sweep + rumble + rail_sound + flange_contact
-        
-        # Add squeal if generated
-        if random.random() < 0.3:
-            squeal_duration = duration * 0.6
-            flange_squeal = self.generate_wheel_flange_squeal(squeal_duration, amplitude=0.18)
-            squeal_start = int((duration - squeal_duration) * 0.5 * self.sample_rate)
             squeal_end = min(squeal_start + len(flange_squeal), len(combined))
             combined[squeal_start:squeal_end] += flange_squeal[:squeal_end - squeal_start]
+            self._pool.put(flange_squeal)
         
         # Smooth envelope
-        samples = len(combined)
-        envelope = np.ones(samples)
-        fade_len = int(0.3 * self.sample_rate)
-        envelope[:fade_len] = np.linspace(0.8, 1.0, fade_len)
-        envelope[-fade_len:] = np.linspace(1.0, 0.8, fade_len)
-        combined = combined * envelope
+        fade_len = self._ms[300]
+        _apply_fades(combined, fade_len, fade_len, 0.8, 0.8)
         
         self.play_sound(combined, blocking=False)
-        time.sleep(duration)
     
     def door_closing(self):
         """Generate and play realistic door closing sequence with compressed air system."""
-        print("  🚪 Doors closing (warning chime)...")
-        
-        # Warning chime - more melodic and less harsh
-        beep_freq = 800
-        for i in range(3):
-            beep = self.generate_tone(beep_freq, 0.18, amplitude=0.22)
-            # Add slight fade to beeps
-            fade = np.linspace(1.0, 0.3, len(beep))
-            beep = beep * fade
-            self.play_sound(beep, blocking=True)
-            time.sleep(0.12)
-        
-        time.sleep(0.25)
-        
-        # Compressed air system activation and door movement
-        print("  💨 Air system engaging - doors closing smoothly...")
+        self._play_door_closing(self._render_door_closing())
+    
+    def _render_door_closing(self) -> np.ndarray:
+        """
+        Render the whole door closing sequence, pauses included, as one buffer.
         
+        Returns:
+            Audio samples of the chime, air release, door movement and final seal
+        """
         # Initial air pressure release as doors unlock (softer)
         air_release = self.generate_compressed_air_release(0.35, amplitude=0.20)
-        self.play_sound(air_release, blocking=True)
         
         # Door motor sound during closing - smoother operation
-        time.sleep(0.08)
         door_motor = self.generate_sweep(210, 145, 1.0, amplitude=0.13)
         
         # Continuous air hiss during movement (quieter, more controlled)
@@ -915,28 +1338,40 @@ class MetroSoundSimulator:
         # Add door mechanism sounds
         mechanism = self.generate_noise(1.0, amplitude=0.08, low_freq=150, high_freq=400)
         
-        door_sound = door_motor + hiss[:len(door_motor)] + mechanism[:len(door_motor)]
-        
-        # Apply envelope for smooth operation
-        envelope = np.ones(len(door_sound))
-        fade_in = int(0.1 * self.sample_rate)
-        fade_out = int(0.15 * self.sample_rate)
-        envelope[:fade_in] = np.linspace(0.3, 1.0, fade_in)
-        envelope[-fade_out:] = np.linspace(1.0, 0.5, fade_out)
-        door_sound = door_sound * envelope
-        
-        self.play_sound(door_sound, blocking=True)
-        
         # Final air pressure equalization and gentle door seal
-        time.sleep(0.08)
         final_air = self.generate_compressed_air_release(0.4, amplitude=0.15)
         # Softer thunk - sealed, not slammed
-        thunk = self.generate_tone(145, 0.12, amplitude=0.30)
-        thunk_envelope = np.exp(-10 * np.linspace(0, 1, len(thunk)))
-        thunk = thunk * thunk_envelope
+        _, thunk = _impact_templates(self.sample_rate, 145, 145, 0.12, 10, bins=1)
+        
+        # Lay everything out in one buffer: chime, pause, air release, then door
+        # movement and seal after short pauses (the pauses are left silent)
+        chime = self._door_chime
+        air_pos = len(chime) + self._ms[370]
+        door_pos = air_pos + len(air_release) + self._ms[80]
+        seal_pos = door_pos + len(door_motor) + self._ms[80]
+        thunk_pos = seal_pos + len(final_air)
+        audio = np.zeros(thunk_pos + thunk.shape[1], dtype=self.dtype)
+        audio[:len(chime)] = chime
+        audio[air_pos:air_pos + len(air_release)] = air_release
+        
+        door_sound = audio[door_pos:door_pos + len(door_motor)]
+        np.add(door_motor, hiss[:len(door_motor)], out=door_sound)
+        door_sound += mechanism[:len(door_motor)]
         
-        combined = np.concatenate([final_air, thunk])
-        self.play_sound(combined, blocking=True)
+        # Apply envelope for smooth operation
+        fade_in = self._ms[100]
+        fade_out = self._ms[150]
+        _apply_fades(door_sound, fade_in, fade_out, 0.3, 0.5)
+        
+        audio[seal_pos:thunk_pos] = final_air
+        np.multiply(thunk[0], 0.30, out=audio[thunk_pos:])
+        return audio
+    
+    def _play_door_closing(self, audio: np.ndarray):
+        """Play a door closing sequence rendered by ``_render_door_closing``."""
+        print("  🚪 Doors closing (warning chime)...")
+        print("  💨 Air system engaging - doors closing smoothly...")
+        self.play_sound(audio, blocking=True)
     
     def acceleration(self, duration: float = 3.0):
         """
@@ -947,7 +1382,18 @@ class MetroSoundSimulator:
             duration: Duration in seconds
         """
         print("  🚀⚡ Smoothly accelerating (electric traction motors)...")
+        self.play_sound(self._render_acceleration(duration), blocking=False)
+    
+    def _render_acceleration(self, duration: float) -> np.ndarray:
+        """
+        Render an acceleration segment without playing it.
         
+        Args:
+            duration: Duration in seconds
+            
+        Returns:
+            Audio samples of the acceleration
+        """
         # Update AI context for acceleration
         if self.enable_ai and self.context:
             self.context.acceleration = 2.0  # m/s^2
@@ -959,12 +1405,11 @@ class MetroSoundSimulator:
                 self.ai_evolution.update(duration, self.context)
         # Base rumble from wheels - starts quiet, gets louder
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
         
         # Gradual amplitude increase for rumble
-        rumble_envelope = np.clip(t / duration, 0.3, 1.0)
+        rumble_envelope = _clipped_ramp(samples, 0.0, 1.0, 0.3, 1.0)
         base_rumble = self.generate_noise(duration, amplitude=0.11)
-        base_rumble = base_rumble * rumble_envelope
+        base_rumble *= rumble_envelope
         
         # Electric traction motor whine with gradual power increase
         # Start from idle, ramp up to cruising speed
@@ -972,17 +1417,17 @@ class MetroSoundSimulator:
         
         # Add progressive motor load (more harmonics as speed increases)
         motor_harmonic = self.generate_sweep(500, 1700, duration, amplitude=0.06)
-        motor_harmonic = motor_harmonic * rumble_envelope
+        motor_harmonic *= rumble_envelope
         
         # Power inverter sound - stronger at beginning (startup surge)
         inverter_duration = duration * 0.5
         inverter = self.generate_inverter_sound(inverter_duration, amplitude=0.10)
-        inverter_envelope = np.exp(-2 * np.linspace(0, 1, len(inverter)))
-        inverter = inverter * inverter_envelope
+        inverter_envelope = _exp_decay(2, len(inverter))
+        inverter *= inverter_envelope
         
         # Add track sounds that increase with speed
         track_noise = self.generate_noise(duration, amplitude=0.07, low_freq=200, high_freq=1500)
-        track_noise = track_noise * rumble_envelope
+        track_noise *= rumble_envelope
         
         # Add low-speed grinding at the start
         grind_duration = min(1.0, duration * 0.35)
@@ -995,26 +1440,28 @@ class MetroSoundSimulator:
             slip_pos = int(slip_time * self.sample_rate)
             wheel_slip = self.generate_wheel_slip(0.5, amplitude=0.25)
         
-        # Combine all sounds
-        combined = np.zeros(samples)
-        combined += base_rumble[:samples]
-        combined += motor_whine[:samples]
-        combined += motor_harmonic[:samples]
-        combined[:len(inverter)] += inverter
-        combined += track_noise[:samples]
-        combined[:len(low_speed_grind)] += low_speed_grind
+        # Combine all sounds in a single pass
+        combined = self._mix_layers(samples, [
+            (base_rumble, 0),
+            (motor_whine, 0),
+            (motor_harmonic, 0),
+            (inverter, 0),
+            (track_noise, 0),
+            (low_speed_grind, 0),
+        ])
+        self._pool.put(low_speed_grind)
         
         # Add wheel slip if triggered
         if add_slip and slip_pos < samples:
             slip_end = min(slip_pos + len(wheel_slip), samples)
             combined[slip_pos:slip_end] += wheel_slip[:slip_end - slip_pos]
+            self._pool.put(wheel_slip)
         
         # Smooth fade in at start
-        fade_in_samples = int(0.3 * self.sample_rate)
-        combined[:fade_in_samples] *= np.linspace(0.5, 1.0, fade_in_samples)
+        fade_in_samples = self._ms[300]
+        _apply_fades(combined, fade_in_samples, 0, start=0.5)
         
-        self.play_sound(combined, blocking=False)
-        time.sleep(duration)
+        return combined
     
     def deceleration(self, duration: float = 2.5):
         """
@@ -1037,19 +1484,18 @@ class MetroSoundSimulator:
                 self.ai_evolution.update(duration, self.context)
         
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
         
         # Gradual amplitude decrease for rumble as speed decreases
-        decel_envelope = np.clip(1.0 - (t / duration) * 0.7, 0.3, 1.0)
+        decel_envelope = _fade_ramp(samples, 1.0, 0.3)
         decel_rumble = self.generate_noise(duration, amplitude=0.13)
-        decel_rumble = decel_rumble * decel_envelope
+        decel_rumble *= decel_envelope
         
         # Electric motor regenerative braking (falling pitch) - smooth power curve
         motor_whine = self.generate_electric_motor_whine(duration, 850, 200, amplitude=0.14)
         
         # Add motor harmonics that fade out
         motor_harmonic = self.generate_sweep(1700, 400, duration, amplitude=0.05)
-        motor_harmonic = motor_harmonic * decel_envelope
+        motor_harmonic *= decel_envelope
         
         # Air brake engagement sound - gradual application
         brake_start = duration * 0.2  # Brakes engage 20% into deceleration
@@ -1058,12 +1504,12 @@ class MetroSoundSimulator:
         
         # Enhanced brake pad friction sound - increases as brakes are applied
         friction_sound = self.generate_noise(duration, amplitude=0.09, low_freq=100, high_freq=400)
-        friction_envelope = np.clip((t / duration) * 1.5, 0.2, 1.0)
-        friction_sound = friction_sound * friction_envelope
+        friction_envelope = _clipped_ramp(samples, 0.0, 1.5, 0.2, 1.0)
+        friction_sound *= friction_envelope
         
         # Track noise decreasing with speed
         track_noise = self.generate_noise(duration, amplitude=0.06, low_freq=300, high_freq=1200)
-        track_noise = track_noise * decel_envelope
+        track_noise *= decel_envelope
         
         # Add low-speed grinding at the end
         grind_start = duration * 0.7  # Grinding becomes more audible at low speed
@@ -1077,23 +1523,22 @@ class MetroSoundSimulator:
             squeal_pos = int(squeal_start_time * self.sample_rate)
             brake_squeal_sound = self.generate_brake_squeal(1.0, amplitude=0.20)
         
-        # Combine all sounds
-        combined = np.zeros(samples)
-        combined += decel_rumble[:samples]
-        combined += motor_whine[:samples]
-        combined += motor_harmonic[:samples]
-        
-        # Add air brake starting partway through
+        # Combine all sounds in a single pass, with the air brake starting partway through
         brake_start_sample = int(brake_start * self.sample_rate)
-        combined[brake_start_sample:brake_start_sample+len(air_brake)] += air_brake
-        
-        combined += friction_sound[:samples]
-        combined += track_noise[:samples]
+        combined = self._mix_layers(samples, [
+            (decel_rumble, 0),
+            (motor_whine, 0),
+            (motor_harmonic, 0),
+            (air_brake, brake_start_sample),
+            (friction_sound, 0),
+            (track_noise, 0),
+        ])
         
         # Add low-speed grinding at the end
         grind_start_sample = int(grind_start * self.sample_rate)
         grind_end = min(grind_start_sample + len(low_speed_grind), samples)
         combined[grind_start_sample:grind_end] += low_speed_grind[:grind_end - grind_start_sample]
+        self._pool.put(low_speed_grind)
         
         # Add brake squeal if triggered
         if add_squeal and squeal_pos < samples:
@@ -1101,11 +1546,10 @@ class MetroSoundSimulator:
             combined[squeal_pos:squeal_end] += brake_squeal_sound[:squeal_end - squeal_pos]
         
         # Smooth fade out at end
-        fade_out_samples = int(0.5 * self.sample_rate)
-        combined[-fade_out_samples:] *= np.linspace(1.0, 0.3, fade_out_samples)
+        fade_out_samples = self._ms[500]
+        _apply_fades(combined, 0, fade_out_samples, end=0.3)
         
         self.play_sound(combined, blocking=False)
-        time.sleep(duration)
     
     def electric_idle(self, duration: float = 1.0):
         """
@@ -1115,47 +1559,61 @@ class MetroSoundSimulator:
             duration: Duration in seconds
         """
         samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, samples, False)
-        
-        # Main power supply hum (50/60 Hz and harmonics)
-        aux_hum = self.generate_tone(120, duration, amplitude=0.07)  # 120 Hz hum
-        aux_hum += self.generate_tone(60, duration, amplitude=0.04)  # 60 Hz base
-        aux_hum += self.generate_tone(180, duration, amplitude=0.03)  # 180 Hz harmonic
-        
-        # Air compressor with realistic cycling (turns on/off)
-        compressor_freq = 180
-        # Create a pulsing envelope for compressor cycling
-        compressor_cycle = 0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t)  # ~3 second cycle
-        compressor = self.generate_tone(compressor_freq, duration, amplitude=0.06)
-        compressor = compressor * compressor_cycle
         
         # Cooling fans (varies slightly)
         fan_freq = random.uniform(90, 110)
-        fan_sound = self.generate_tone(fan_freq, duration, amplitude=0.05)
         fan_noise = self.generate_noise(duration, amplitude=0.03, low_freq=80, high_freq=300)
         
-        # High frequency inverter standby with slight modulation
+        # High frequency inverter standby (modulated at 120 Hz below)
         inverter_idle = self.generate_noise(duration, amplitude=0.035, low_freq=3000, high_freq=5000)
-        inverter_modulation = 1 + 0.1 * np.sin(2 * np.pi * 120 * t)
-        inverter_idle = inverter_idle * inverter_modulation
+        
+        if NUMBA_AVAILABLE:
+            # Hum, compressor, fan and inverter modulation fused into one compiled pass
+            combined = np.empty(samples, dtype=self.dtype)
+            render_electric_idle(combined, self.sample_rate, fan_freq, fan_noise, inverter_idle)
+        else:
+            # Fixed-frequency sines gathered from the sine table one at a time into a
+            # scratch buffer and accumulated, so only one sine is held at once
+            layer = self._scratch_slice(samples)
+            
+            # Air compressor at 180 Hz with realistic cycling (~3 second cycle)
+            combined = _lut_sines(0.3, samples, self.sample_rate, out=np.empty(samples, dtype=self.dtype))
+            combined *= 0.5
+            combined += 0.5
+            _lut_sines(180, samples, self.sample_rate, out=layer)
+            combined *= layer
+            combined *= 0.06
+            
+            # Main power supply hum (50/60 Hz and harmonics, the 180 Hz one still in
+            # the scratch buffer) and cooling fan tone
+            layer *= 0.03
+            combined += layer
+            for freq, amp in ((120, 0.07), (60, 0.04), (fan_freq, 0.05)):
+                _lut_sines(freq, samples, self.sample_rate, out=layer)
+                layer *= amp
+                combined += layer
+            
+            # Inverter standby with slight 120 Hz modulation
+            _lut_sines(120, samples, self.sample_rate, out=layer)
+            layer *= 0.1
+            layer += 1
+            layer *= inverter_idle
+            combined += layer
+            
+            combined += fan_noise
         
         # Occasional relay clicks and system sounds
-        relay_sound = np.zeros(samples)
         num_relays = random.randint(1, 3)
+        click = self._relay_click
         for _ in range(num_relays):
             relay_pos = random.randint(0, samples - 1000)
-            click = self.generate_tone(800, 0.02, amplitude=0.15)
-            relay_sound[relay_pos:relay_pos+len(click)] += click
-        
-        combined = aux_hum + compressor + fan_sound + fan_noise + inverter_idle + relay_sound
+            combined[relay_pos:relay_pos+len(click)] += click[:samples - relay_pos]
         
         # Smooth transitions
-        fade_samples = int(0.2 * self.sample_rate)
-        combined[:fade_samples] *= np.linspace(0.5, 1.0, fade_samples)
-        combined[-fade_samples:] *= np.linspace(1.0, 0.5, fade_samples)
+        fade_samples = self._ms[200]
+        _apply_fades(combined, fade_samples, fade_samples, 0.5, 0.5)
         
         self.play_sound(combined, blocking=False)
-        time.sleep(duration)
     
 
     
@@ -1190,14 +1648,12 @@ class MetroSoundSimulator:
                     print("  🛤️🤖 AI detected: Crossing rail switch (aiguillage)...")
                     switch_sound = self.generate_rail_switch(1.2, amplitude=0.22)
                     self.play_sound(switch_sound, blocking=False)
-                    time.sleep(1.2)
                     elapsed += 1.2
                     continue
                 elif predicted_event == 'rail_defect' and elapsed < duration - 1.0:
                     print("  ⚠️🤖 AI detected: Rail defect...")
                     defect_sound = self.generate_rail_defects(0.8, amplitude=0.18)
                     self.play_sound(defect_sound, blocking=False)
-                    time.sleep(0.8)
                     elapsed += 0.8
                     continue
                 elif predicted_event == 'curve' and elapsed < duration - 3.0:
@@ -1215,7 +1671,6 @@ class MetroSoundSimulator:
                     print("  🛤️  Crossing rail switch (aiguillage)...")
                     switch_sound = self.generate_rail_switch(1.2, amplitude=0.22)
                     self.play_sound(switch_sound, blocking=False)
-                    time.sleep(1.2)
                     elapsed += 1.2
                 
                 # Occasionally add rail defects (less frequent than switches)
@@ -1223,7 +1678,6 @@ class MetroSoundSimulator:
                     print("  ⚠️  Rail defect detected...")
                     defect_sound = self.generate_rail_defects(0.8, amplitude=0.18)
                     self.play_sound(defect_sound, blocking=False)
-                    time.sleep(0.8)
                     elapsed += 0.8
                 
                 # Occasionally add a gentle curve (realistic metro routes have curves)
@@ -1238,13 +1692,19 @@ class MetroSoundSimulator:
         """Execute a complete station departure sequence."""
         print("\n📍 At station - preparing to depart...")
         
+        # Render the doors first, then let the prefetch worker render the departure
+        # while they play (only one thread draws random numbers at a time)
+        doors = self._render_door_closing()
+        departure = self._prefetch.submit(self._render_acceleration, 4.0)
+        
         # Doors close
-        self.door_closing()
-        time.sleep(0.3)
+        self._play_door_closing(doors)
+        self.pause(0.3)
         
         # Gradual acceleration
         print("  🚀⚡ Departing station (gradual acceleration)...")
-        self.acceleration(4.0)
+        print("  🚀⚡ Smoothly accelerating (electric traction motors)...")
+        self.play_sound(departure.result(), blocking=False)
     
     def station_arrival_sequence(self):
         """Execute a complete station arrival sequence."""
@@ -1252,7 +1712,7 @@ class MetroSoundSimulator:
         
         # Gradual deceleration
         self.deceleration(3.5)
-        time.sleep(0.3)
+        self.pause(0.3)
         
         # Stop at station with idle sounds
         print("  ⏸️  Arrived at station (electric systems humming)...")
@@ -1271,7 +1731,9 @@ class MetroSoundSimulator:
         print(f"Starting {duration_minutes}-minute realistic metro journey...\n")
         print("🎵 Continuous ambient sounds with logical transitions\n")
         
-        start_time = time.time()
+        # The journey clock counts queued audio, which runs ahead of the wall clock
+        # while the next segment is synthesized during playback
+        start_time = self.audio_time()
         end_time = start_time + (duration_minutes * 60)
         
         self.is_running = True
@@ -1280,8 +1742,8 @@ class MetroSoundSimulator:
             # Start journey: departure from initial station
             self.station_departure_sequence()
             
-            while time.time() < end_time and self.is_running:
-                remaining_time = end_time - time.time()
+            while self.audio_time() < end_time and self.is_running:
+                remaining_time = end_time - self.audio_time()
                 
                 # Need at least 15 seconds for a station stop cycle
                 if remaining_time < 15:
@@ -1296,23 +1758,29 @@ class MetroSoundSimulator:
                 self.continuous_journey_segment(cruise_duration)
                 
                 # Check if we have time for station stop
-                remaining_time = end_time - time.time()
+                remaining_time = end_time - self.audio_time()
                 if remaining_time >= 10:
                     # Arrive at station
                     self.station_arrival_sequence()
                     
                     # Check if we should depart (need time for departure)
-                    remaining_time = end_time - time.time()
+                    remaining_time = end_time - self.audio_time()
                     if remaining_time >= 5:
                         self.station_departure_sequence()
                     else:
                         print("\n🏁 Journey ending at station...")
                         break
+            
+            # Let the last queued segment finish playing
+            self.wait_for_playback()
         
         except KeyboardInterrupt:
             print("\n\n⏹️  Simulation stopped by user")
             self.is_running = False
         
+        finally:
+            self._close_stream()
+        
         print("\n" + "="*60)
         print("🏁 Metro journey complete!")
         print("="*60 + "\n")
@@ -1354,8 +1822,8 @@ def main():
     time.sleep(1)
     
     # Create and run simulator
-    simulator = MetroSoundSimulator(sample_rate=44100)
-    simulator.run_simulation(duration_minutes=duration)
+    with MetroSoundSimulator(sample_rate=44100) as simulator:
+        simulator.run_simulation(duration_minutes=duration)
 
 
 if __name__ == "__main__":
@@ -58,6 +58,17 @@ def test_ai_parameter_learner():
     predicted_with_context = learner.predict_parameter('test_param', context)
     assert isinstance(predicted_with_context, float)
     
+    # History only holds the values actually learned
+    learner.learn_parameter('single', 0.7)
+    assert learner.parameter_history['single'].tolist() == [0.7]
+    
+    # Once the memory wraps, only the most recent values shape the model
+    for i in range(80):
+        learner.learn_parameter('wrapped', float(i))
+    model = learner.variation_model['wrapped']
+    assert abs(model['trend'] - (79 - 30) / 50) < 1e-12, "Trend should span the last 50 values"
+    assert sorted(learner.parameter_history['wrapped']) == list(range(30, 80))
+    
     print("  ✓ AIParameterLearner test passed")
 
 
@@ -77,6 +88,12 @@ def test_intelligent_noise_generator():
     noise_with_context = generator.generate_intelligent_noise(1.0, 0.1, context)
     assert len(noise_with_context) == 44100
     assert isinstance(noise_with_context, np.ndarray)
+    assert noise_with_context.dtype == np.float32
+    
+    # Draws come from the given generator, so seeded generators repeat
+    first = IntelligentNoiseGenerator(44100, np.random.default_rng(7)).generate_intelligent_noise(0.1, 0.1)
+    second = IntelligentNoiseGenerator(44100, np.random.default_rng(7)).generate_intelligent_noise(0.1, 0.1)
+    assert np.array_equal(first, second)
     
     print("  ✓ IntelligentNoiseGenerator test passed")
 
@@ -173,6 +190,17 @@ def test_intelligent_event_predictor():
     for event in events_predicted:
         assert event in valid_events
     
+    # A batch of checks matches the same checks made one at a time
+    times = np.arange(2000.0)
+    batched = IntelligentEventPredictor(np.random.default_rng(3)).predict_events(times, context)
+    single = IntelligentEventPredictor(np.random.default_rng(3))
+    assert batched == [single.predict_event(t, context) for t in times]
+    assert any(batched), "2000 checks should predict at least one event"
+    
+    # Equal contexts share one cached probability table
+    same_context = SoundContext(speed=50.0, track_wear=0.8, vehicle_age=0.7)
+    assert predictor._event_probabilities(context) is predictor._event_probabilities(same_context)
+    
     print("  ✓ IntelligentEventPredictor test passed")
 
 
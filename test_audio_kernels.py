@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Test script for compiled audio kernels
+Checks each kernel against its NumPy reference implementation.
+"""
+
+import numpy as np
+import sys
+from audio_kernels import (
+    moving_average,
+    sos_filter,
+    fft_length,
+    spectral_noise,
+    SINE_TABLE_SIZE,
+    render_tone,
+    render_sweep,
+    render_motor_whine,
+    render_electric_idle,
+    modulate_rumble,
+    scatter_clicks,
+    scatter_templates,
+    mix_layers,
+    mean_std
+)
+
+
+def test_moving_average():
+    """Test that the running-sum boxcar matches np.convolve in 'same' mode."""
+    print("Testing moving average filter...")
+    signal = np.random.normal(0, 0.1, 5000)
+
+    for window_size in [1, 2, 7, 8, 220, 6000]:
+        expected = np.convolve(signal, np.ones(window_size) / window_size, mode='same')
+        filtered = moving_average(signal, window_size)
+        assert filtered.shape == expected.shape, f"Window {window_size}: shape mismatch"
+        assert np.allclose(filtered, expected, atol=1e-9), f"Window {window_size}: values differ"
+
+    print("  ✓ Moving average filter test passed")
+
+
+def test_sos_filter():
+    """Test the biquad cascade against the direct-form difference equation."""
+    print("Testing biquad cascade filter...")
+    signal = np.random.normal(0, 0.1, 2000)
+    sos = np.array([[0.02, 0.04, 0.02, 1.0, -1.6, 0.7],
+                    [1.0, -2.0, 1.0, 1.0, -1.9, 0.91]])
+
+    expected = signal.copy()
+    for b0, b1, b2, _, a1, a2 in sos:
+        x = np.concatenate(([0.0, 0.0], expected))
+        y = np.zeros(len(x))
+        for i in range(2, len(x)):
+            y[i] = b0 * x[i] + b1 * x[i - 1] + b2 * x[i - 2] - a1 * y[i - 1] - a2 * y[i - 2]
+        expected = y[2:]
+
+    filtered = signal.copy()
+    sos_filter(filtered, sos)
+    assert np.allclose(filtered, expected, atol=1e-9), "Cascade should match the difference equation"
+
+    print("  ✓ Biquad cascade filter test passed")
+
+
+def test_spectral_noise():
+    """Test that frequency-domain noise stays inside its band at white-noise level."""
+    print("Testing spectral noise synthesis...")
+    sample_rate = 44100
+    samples = 44100
+    amplitude = 0.1
+
+    noise = spectral_noise(samples, amplitude, 800, 2000, sample_rate)
+    assert len(noise) == samples, f"Expected {samples} samples, got {len(noise)}"
+    assert noise.dtype == np.float32, "Noise should be float32"
+
+    # All energy sits in the requested band
+    spectrum = np.abs(np.fft.rfft(noise)) ** 2
+    freqs = np.fft.rfftfreq(samples, 1 / sample_rate)
+    in_band = spectrum[(freqs >= 800) & (freqs < 2000)].sum()
+    assert in_band / spectrum.sum() > 0.999, "Noise energy should be inside the band"
+
+    # Level matches white noise of the same amplitude passed through the band
+    expected_std = amplitude * np.sqrt((2000 - 800) / (sample_rate / 2))
+    assert abs(np.std(noise) / expected_std - 1) < 0.1, "Noise level should match band-limited white noise"
+
+    # Prime lengths are synthesized at a fast FFT length and truncated
+    assert fft_length(44100) == 44100, "Smooth lengths should be kept"
+    assert fft_length(661513) == 663552, "Prime lengths should round up to a 5-smooth length"
+    noise = spectral_noise(661513, amplitude, 800, 2000, sample_rate)
+    assert len(noise) == 661513, "Truncated noise should have the requested length"
+    assert noise.flags.owndata, "Truncated noise should not keep the padded buffer alive"
+    assert abs(np.std(noise) / expected_std - 1) < 0.1, "Truncated noise level should be unchanged"
+
+    print("  ✓ Spectral noise synthesis test passed")
+
+
+def test_render_tone():
+    """Test the sine-table tone kernel against np.sin."""
+    print("Testing tone kernel...")
+    sample_rate = 44100
+    samples = 44100
+    t = np.arange(samples) / sample_rate
+
+    for frequency in [3.0, 440.0, 2517.3]:
+        out = np.empty(samples, dtype=np.float32)
+        render_tone(out, frequency * SINE_TABLE_SIZE / sample_rate, 0.3)
+        expected = 0.3 * np.sin(2 * np.pi * frequency * t)
+        assert np.max(np.abs(out - expected)) < 1e-3, f"{frequency} Hz: kernel should match np.sin"
+
+    print("  ✓ Tone kernel test passed")
+
+
+def test_render_sweep():
+    """Test the sweep kernel against a faded closed-form chirp."""
+    print("Testing sweep kernel...")
+    sample_rate = 44100
+    samples = 66150
+    duration = samples / sample_rate
+    fade = 2205
+    t = np.arange(samples) / sample_rate
+
+    out = np.empty(samples, dtype=np.float32)
+    render_sweep(out, 1200 * SINE_TABLE_SIZE / sample_rate,
+                 (1800 - 1200) / duration * SINE_TABLE_SIZE / sample_rate ** 2, fade, 0.4)
+
+    expected = 0.4 * np.sin(2 * np.pi * t * (1200 + 0.5 * (1800 - 1200) / duration * t))
+    expected[:fade] *= np.linspace(0, 1, fade)
+    expected[-fade:] *= np.linspace(1, 0, fade)
+    assert np.max(np.abs(out - expected)) < 1e-3, "Kernel should match the faded chirp"
+
+    print("  ✓ Sweep kernel test passed")
+
+
+def test_render_motor_whine():
+    """Test the motor whine kernel against the faded harmonic chirp with PWM."""
+    print("Testing motor whine kernel...")
+    sample_rate = 44100
+    samples = 88200
+    duration = samples / sample_rate
+    fade = 2205
+    t = np.arange(samples) / sample_rate
+    step = SINE_TABLE_SIZE / sample_rate
+
+    out = np.empty(samples, dtype=np.float32)
+    render_motor_whine(out, 300 * step, (800 - 300) / duration * step / sample_rate,
+                       5000 * step, fade, 0.15)
+
+    phase = 2 * np.pi * t * (300 + 0.5 * (800 - 300) / duration * t)
+    expected = 0.15 * (np.sin(phase) + 0.3 * np.sin(2 * phase) + 0.15 * np.sin(3 * phase))
+    expected *= 1 + 0.03 * np.sin(2 * np.pi * 5000 * t)
+    expected[:fade] *= np.linspace(0, 1, fade)
+    expected[-fade:] *= np.linspace(1, 0, fade)
+    assert np.max(np.abs(out - expected)) < 1e-3, "Kernel should match the harmonic chirp"
+
+    print("  ✓ Motor whine kernel test passed")
+
+
+def test_render_electric_idle():
+    """Test the fused electric idle kernel against the NumPy layering."""
+    print("Testing electric idle kernel...")
+    sample_rate = 8000
+    samples = 4000
+    t = np.arange(samples) / sample_rate
+    fan_noise = np.random.normal(0, 0.03, samples)
+    inverter_idle = np.random.normal(0, 0.035, samples)
+
+    out = np.empty(samples)
+    render_electric_idle(out, sample_rate, 100.0, fan_noise, inverter_idle)
+
+    expected = (0.07 * np.sin(2 * np.pi * 120 * t)
+                + 0.04 * np.sin(2 * np.pi * 60 * t)
+                + 0.03 * np.sin(2 * np.pi * 180 * t)
+                + 0.06 * np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t))
+                + 0.05 * np.sin(2 * np.pi * 100 * t)
+                + fan_noise
+                + inverter_idle * (1 + 0.1 * np.sin(2 * np.pi * 120 * t)))
+    assert np.allclose(out, expected, atol=1e-6), "Kernel should match NumPy layering"
+
+    print("  ✓ Electric idle kernel test passed")
+
+
+def test_modulate_rumble():
+    """Test the fused rumble modulation kernel against the NumPy layering."""
+    print("Testing rumble modulation kernel...")
+    sample_rate = 8000
+    samples = 5000
+    t = np.arange(samples) / sample_rate
+    rumble = np.random.normal(0, 0.1, samples)
+    variation = np.random.uniform(0.98, 1.02, 3000)
+    start = 2500
+
+    out = rumble.copy()
+    modulate_rumble(out, variation, start, sample_rate)
+
+    wrapped = variation[(start + np.arange(samples)) % len(variation)]
+    expected = rumble * (wrapped
+                         + 0.04 * np.sin(2 * np.pi * 8 * t)
+                         + 0.03 * np.sin(2 * np.pi * 3 * t))
+    assert np.allclose(out, expected, atol=1e-9), "Kernel should match NumPy layering"
+
+    print("  ✓ Rumble modulation kernel test passed")
+
+
+def test_scatter_clicks():
+    """Test the click overlap-add kernel against slice-by-slice addition."""
+    print("Testing click scatter kernel...")
+    samples = 8000
+    positions = np.array([0, 2400, 4790, 7990], dtype=np.int64)
+    first = np.random.normal(0, 0.1, 160)
+    second = np.random.normal(0, 0.1, 240)
+    offset = 40
+
+    out = np.zeros(samples)
+    scatter_clicks(out, positions, first, second, offset)
+
+    expected = np.zeros(samples)
+    for pos in positions:
+        end = min(pos + len(first), samples)
+        expected[pos:end] += first[:end - pos]
+        pos2 = pos + offset
+        if pos2 < samples:
+            end = min(pos2 + len(second), samples)
+            expected[pos2:end] += second[:end - pos2]
+
+    assert np.allclose(out, expected, atol=1e-9), "Kernel should match slice addition"
+
+    print("  ✓ Click scatter kernel test passed")
+
+
+def test_scatter_templates():
+    """Test the template overlap-add kernel against slice-by-slice addition."""
+    print("Testing template scatter kernel...")
+    samples = 4000
+    templates = np.random.normal(0, 0.1, (4, 240))
+    positions = np.array([-100, 0, 1200, 1300, 3900], dtype=np.int64)
+    rows = np.array([3, 0, 1, 1, 2], dtype=np.int64)
+    gains = np.array([0.5, 1.0, 0.2, 0.7, 0.9])
+
+    out = np.zeros(samples)
+    scatter_templates(out, positions, rows, gains, templates)
+
+    expected = np.zeros(samples)
+    for pos, row, gain in zip(positions, rows, gains):
+        start = max(pos, 0)
+        end = min(pos + templates.shape[1], samples)
+        expected[start:end] += gain * templates[row, start - pos:end - pos]
+
+    assert np.allclose(out, expected, atol=1e-9), "Kernel should match slice addition"
+
+    print("  ✓ Template scatter kernel test passed")
+
+
+def test_mix_layers():
+    """Test the six-layer mixing kernel against offset slice addition."""
+    print("Testing layer mixing kernel...")
+    samples = 3000
+    layers = [np.random.normal(0, 0.1, n) for n in (3000, 3200, 1000, 500, 2000)]
+    layers.append(np.empty(0))
+    offsets = np.array([0, 0, 200, 2800, 1500, 0], dtype=np.int64)
+
+    out = np.full(samples, 9.0)
+    mix_layers(out, *layers, offsets)
+
+    expected = np.zeros(samples)
+    for layer, start in zip(layers, offsets):
+        end = min(start + len(layer), samples)
+        expected[start:end] += layer[:end - start]
+
+    assert np.allclose(out, expected, atol=1e-9), "Kernel should match slice addition"
+
+    print("  ✓ Layer mixing kernel test passed")
+
+
+def test_mean_std():
+    """Test the two-pass statistics kernel against np.mean and np.std."""
+    print("Testing mean/std kernel...")
+    for n in (1, 11, 100):
+        values = np.random.normal(3.0, 0.5, n)
+        mean, std = mean_std(values)
+        assert abs(mean - np.mean(values)) < 1e-12, f"{n} values: mean differs"
+        assert abs(std - np.std(values)) < 1e-12, f"{n} values: std differs"
+
+    print("  ✓ Mean/std kernel test passed")
+
+
+def run_all_tests():
+    """Run all audio kernel tests."""
+    print("\n" + "="*60)
+    print("⚙️  AUDIO KERNELS - TEST SUITE")
+    print("="*60 + "\n")
+
+    tests = [
+        test_moving_average,
+        test_sos_filter,
+        test_spectral_noise,
+        test_render_tone,
+        test_render_sweep,
+        test_render_motor_whine,
+        test_render_electric_idle,
+        test_modulate_rumble,
+        test_scatter_clicks,
+        test_scatter_templates,
+        test_mix_layers,
+        test_mean_std,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ {test.__name__} failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ {test.__name__} error: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("="*60)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
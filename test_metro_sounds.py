@@ -6,7 +6,8 @@ Validates sound generation functions without requiring audio playback.
 
 import numpy as np
 import sys
-from metro_sounds import MetroSoundSimulator
+import threading
+from metro_sounds import MetroSoundSimulator, _impact_templates, _template_rows
 
 
 def test_initialization():
@@ -34,6 +35,10 @@ def test_generate_tone():
     assert np.max(tone) <= 0.5, "Tone amplitude too high"
     assert np.min(tone) >= -0.5, "Tone amplitude too low"
     
+    # Table lookup stays within the LUT's resolution of an exact sine
+    exact = 0.5 * np.sin(2 * np.pi * 440 * np.arange(expected_samples) / 44100)
+    assert np.max(np.abs(tone - exact)) < 1e-3, "Tone should follow an exact sine"
+    
     print("  ✓ Tone generation test passed")
 
 
@@ -52,6 +57,14 @@ def test_generate_noise():
     # Check that it's not silent
     assert np.std(noise) > 0, "Noise should not be silent"
     
+    # Rain damping in the AI generator must not leave high bands (air hiss) near silent:
+    # they keep the level of the damped noise instead of only the band-pass leakage
+    simulator.context.weather_condition = "rain"
+    hiss = np.mean([np.std(simulator.generate_noise(0.5, 0.1, 3000, 10000)) for _ in range(10)])
+    damped = np.mean([np.std(simulator.ai_noise_generator.generate_intelligent_noise(0.5, 0.1, simulator.context))
+                      for _ in range(10)])
+    assert hiss > 0.5 * damped, "Rain should not drop high-band noise far below the damped level"
+    
     print("  ✓ Noise generation test passed")
 
 
@@ -316,9 +329,173 @@ def test_rail_defects_generation():
         # Check non-zero output
         assert np.max(np.abs(defect_sound)) > 0.005, "Rail defects should be audible"
     
+    # Short defects leave little or no room for impacts but must still render
+    for duration in (0.15, 0.2, 0.25, 0.29):
+        for _ in range(40):
+            defect_sound = simulator.generate_rail_defects(duration, amplitude=0.2)
+            assert len(defect_sound) == int(44100 * duration), f"{duration}s defect has the wrong length"
+    
     print("  ✓ Rail defects generation test passed")
 
 
+def test_float32_output():
+    """Test that generators produce single-precision audio buffers."""
+    print("Testing float32 audio buffers...")
+    # Both the AI-enhanced and the standard noise paths
+    for simulator in (MetroSoundSimulator(), MetroSoundSimulator(enable_ai=False)):
+        results = [
+            ("tone", simulator.generate_tone(440, 0.5)),
+            ("noise", simulator.generate_noise(0.5)),
+            ("sweep", simulator.generate_sweep(500, 1000, 0.5)),
+            ("motor", simulator.generate_electric_motor_whine(0.5)),
+            ("air", simulator.generate_compressed_air_release(0.5)),
+            ("inverter", simulator.generate_inverter_sound(0.5)),
+            ("flange", simulator.generate_wheel_flange_squeal(0.5)),
+            ("clicks", simulator.generate_rail_joint_clicks(1.0)),
+            ("brake", simulator.generate_brake_squeal(0.5)),
+            ("grinding", simulator.generate_low_speed_grinding(0.5)),
+            ("slip", simulator.generate_wheel_slip(0.5)),
+            ("switch", simulator.generate_rail_switch(1.2)),
+            ("defects", simulator.generate_rail_defects(0.8)),
+        ]
+        
+        for name, result in results:
+            assert result.dtype == np.float32, f"{name} should be float32, got {result.dtype}"
+    
+    print("  ✓ Float32 audio buffers test passed")
+
+
+def test_audio_callback_queue():
+    """Test that the output stream callback drains queued audio in order."""
+    print("Testing audio stream callback...")
+    simulator = MetroSoundSimulator()
+    
+    clip = np.linspace(0.1, 0.5, 100, dtype=np.float32)
+    done = threading.Event()
+    simulator._audio_queue.put((clip, done))
+    
+    # First callback consumes part of the clip
+    outdata = np.ones((64, 1), dtype=np.float32)
+    simulator._audio_callback(outdata, 64, None, None)
+    assert np.allclose(outdata[:, 0], clip[:64]), "Callback should copy queued samples"
+    assert not done.is_set(), "Clip should not be marked finished yet"
+    
+    # Second callback finishes the clip and pads the rest with silence
+    simulator._audio_callback(outdata, 64, None, None)
+    assert np.allclose(outdata[:36, 0], clip[64:]), "Callback should continue where it left off"
+    assert np.all(outdata[36:] == 0), "Underrun should be filled with silence"
+    assert done.is_set(), "Clip should be marked finished once fully played"
+    
+    print("  ✓ Audio stream callback test passed")
+
+
+def test_buffer_pool():
+    """Test that released buffers are reused zeroed and the pool stays bounded."""
+    print("Testing output buffer pool...")
+    simulator = MetroSoundSimulator()
+    pool = simulator._pool
+    
+    buffer = pool.get(1000)
+    buffer += 0.5
+    pool.put(buffer)
+    
+    reused = pool.get(1000)
+    assert reused is buffer, "Released buffer should be reused for the same length"
+    assert np.all(reused == 0), "Reused buffer should be zeroed"
+    
+    # Views are never pooled, and the pool never holds more than its limit
+    pool.put(reused[:500])
+    assert pool.get(500) is not reused, "Views should not be pooled"
+    for samples in range(1, pool.max_buffers + 10):
+        pool.put(np.zeros(samples, dtype=np.float32))
+    assert pool._count == pool.max_buffers, "Pool should evict the oldest buffers"
+    
+    # Tones and sweeps render into a caller-provided buffer
+    buffer = pool.get(simulator.sample_rate // 2)
+    tone = simulator.generate_tone(440, 0.5, 0.3, out=buffer)
+    assert tone is buffer, "Tone should be rendered into the given buffer"
+    assert np.array_equal(tone, simulator.generate_tone(440, 0.5, 0.3)), "Tone should not depend on out"
+    sweep = simulator.generate_sweep(500, 1000, 0.5, 0.4, out=buffer)
+    assert sweep is buffer, "Sweep should be rendered into the given buffer"
+    assert np.array_equal(sweep, simulator.generate_sweep(500, 1000, 0.5, 0.4)), "Sweep should not depend on out"
+    
+    print("  ✓ Output buffer pool test passed")
+
+
+def test_impact_templates():
+    """Test that template rows match freshly synthesized decaying tones."""
+    print("Testing impact template tables...")
+    simulator = MetroSoundSimulator()
+    
+    freqs, table = _impact_templates(simulator.sample_rate, 1700, 2400, 0.015, 80)
+    assert table.shape == (16, int(simulator.sample_rate * 0.015)), "Table should hold one row per bin"
+    assert table.dtype == np.float32, "Table should be float32"
+    assert _impact_templates(simulator.sample_rate, 1700, 2400, 0.015, 80)[1] is table, "Table should be cached"
+    
+    row = _template_rows(freqs, 2010.0)[0]
+    assert abs(freqs[row] - 2010.0) <= (2400 - 1700) / 15 / 2, "Lookup should pick the nearest bin"
+    t = np.arange(table.shape[1]) / simulator.sample_rate
+    impact = np.sin(2 * np.pi * freqs[row] * t) * np.exp(-80 * np.linspace(0, 1, len(t)))
+    assert np.allclose(table[row], impact, atol=1e-5), "Row should match a synthesized impact"
+    
+    print("  ✓ Impact template tables test passed")
+
+
+def test_prefetched_segments():
+    """Test that segments rendered on the prefetch worker come back ready to play."""
+    print("Testing prefetched segment rendering...")
+    simulator = MetroSoundSimulator()
+    
+    doors = simulator._render_door_closing()
+    departure = simulator._prefetch.submit(simulator._render_acceleration, 1.0)
+    
+    assert doors.dtype == np.float32, "Door sequence should be float32"
+    assert np.all(doors[:len(simulator._door_chime)] == simulator._door_chime), "Door sequence should start with the chime"
+    
+    audio = departure.result()
+    assert len(audio) == simulator.sample_rate, "Acceleration should match its duration"
+    assert audio.dtype == np.float32, "Acceleration should be float32"
+    assert np.all(np.isfinite(audio)), "Acceleration should be finite"
+    
+    print("  ✓ Prefetched segment rendering test passed")
+
+
+def test_close():
+    """Test that closing the simulator shuts down its worker threads."""
+    print("Testing simulator shutdown...")
+    with MetroSoundSimulator(enable_ai=False) as simulator:
+        squeal = simulator.generate_wheel_flange_squeal(0.5)
+        assert len(squeal) == int(44100 * 0.5), "Squeal should render before closing"
+    
+    for pool in (simulator._executor, simulator._prefetch):
+        try:
+            pool.submit(int)
+            assert False, "Worker pools should reject jobs after close()"
+        except RuntimeError:
+            pass
+    
+    print("  ✓ Simulator shutdown test passed")
+
+
+def test_variation_noise():
+    """Test that pre-rolled track variation wraps around its slab."""
+    print("Testing pre-rolled track variation...")
+    simulator = MetroSoundSimulator(sample_rate=8000)
+    slab = simulator._variation_slab
+    
+    samples = 2 * len(slab) + 100
+    noise = simulator._variation_noise(samples)
+    assert len(noise) == samples, "Variation should have the requested length"
+    assert noise.dtype == np.float32, "Variation should be float32"
+    assert np.all((noise >= 0.98) & (noise <= 1.02)), "Variation should stay within 2% of unity"
+    
+    # Every full slab length later the same values repeat
+    assert np.array_equal(noise[:100], noise[len(slab):len(slab) + 100]), "Variation should wrap around"
+    assert np.isin(noise[:10], slab).all(), "Variation should be read from the slab"
+    
+    print("  ✓ Pre-rolled track variation test passed")
+
+
 def run_all_tests():
     """Run all tests and report results."""
     print("\n" + "="*60)
@@ -343,6 +520,13 @@ def run_all_tests():
         test_wheel_slip_generation,
         test_rail_switch_generation,
         test_rail_defects_generation,
+        test_float32_output,
+        test_audio_callback_queue,
+        test_buffer_pool,
+        test_impact_templates,
+        test_prefetched_segments,
+        test_close,
+        test_variation_noise,
     ]
     
     passed = 0